@@ -50,6 +50,8 @@ def QT_TRANSLATE_NOOP(context, text):  #
 
 gRoundPrecision = 2  # should be set according to the user FreeCAD GUI settings
 gSearchDepth = 200  # recursive search depth
+gSubIndex = dict()  # vertex, edge and face index for objects, see getSubIndex
+gSubIndexSize = 500  # max objects at gSubIndex, the index is cleared if there are more
 
 # end globals (for API generator)
 
@@ -185,6 +187,109 @@ def normalizeBoundBox(iBoundBox):
     return b
 
 
+# ###################################################################################################################
+def getSubKey(iValue, iType):
+    """
+    Description:
+
+            Returns key for sub-object search. The same sub-objects have the same key,
+            so the key can be used to find the sub-object again, also at new object.
+
+    Args:
+
+            iValue: Vertex object for "Vertex" type, BoundBox for other types
+            iType: type of the key:
+                    "Vertex" - vertex position rounded to gRoundPrecision, the same as equal function
+                    "BoundBox" - exact BoundBox, the same as str(BoundBox) comparison
+                    "normalized" - BoundBox rounded by normalizeBoundBox function
+
+    Usage:
+
+            key = MagicPanels.getSubKey(face.BoundBox, "normalized")
+
+    Result:
+
+            return key for getSubIndex function
+
+    """
+
+    if iType == "Vertex":
+        return (round(iValue.X, gRoundPrecision), round(iValue.Y, gRoundPrecision), round(iValue.Z, gRoundPrecision))
+
+    if iType == "BoundBox":
+        return str(iValue)
+
+    return normalizeBoundBox(iValue)
+
+
+# ###################################################################################################################
+def getSubIndex(iObj, iSub, iType, iValue):
+    """
+    Description:
+
+            Returns sub-object index for given object. The index for all sub-objects is created
+            only once for the object Shape and stored at gSubIndex. It is created again only if the
+            object Shape has been changed, so many searches at the same object, for example the
+            drilled face search after makeHoles, do not loop over all faces each time.
+
+    Args:
+
+            iObj: object of the sub-object
+            iSub: sub-object type "Vertex", "Edge" or "Face"
+            iType: key type, see getSubKey function
+            iValue: Vertex object for "Vertex" type, BoundBox for other types
+
+    Usage:
+
+            faceIndex = MagicPanels.getSubIndex(o, "Face", "normalized", key)
+
+    Result:
+
+            return int value for the sub-object, starting from 1, so you can create string
+            Face + faceIndex, or -1 if not found
+
+    """
+
+    shape = iObj.Shape
+    key = getSubKey(iValue, iType)
+    shapeHash = shape.hashCode()
+    cache = (str(iObj.Document.Name), str(iObj.Name), iSub, iType)
+
+    if cache in gSubIndex and gSubIndex[cache][0] == shapeHash:
+        index = gSubIndex[cache][1].get(key, -1)
+
+        # the same Shape hash can be reused after recompute, so check the found sub-object
+        if index != -1:
+            sub = shape.getElement(iSub + str(index))
+            if iSub != "Vertex":
+                sub = sub.BoundBox
+
+            if getSubKey(sub, iType) == key:
+                return index
+
+    if len(gSubIndex) > gSubIndexSize:
+        gSubIndex.clear()
+
+    if iSub == "Vertex":
+        subs = touchTypo(shape)
+    else:
+        subs = getattr(shape, iSub + "s")
+
+    # the first sub-object for the key, the same as loop search
+    keys = dict()
+    index = 1
+    for sub in subs:
+        if iSub != "Vertex":
+            sub = sub.BoundBox
+
+        keys.setdefault(getSubKey(sub, iType), index)
+        index = index + 1
+
+    gSubIndex[cache] = [shapeHash, keys]
+
+    return keys.get(key, -1)
+
+
 # ###################################################################################################################
 """
 # Vertices
@@ -303,15 +408,7 @@ def getVertexIndex(iObj, iVertex):
 
     """
 
-    index = 1
-    ves = touchTypo(iObj.Shape)
-    for v in ves:
-        if equal(v.X, iVertex.X) and equal(v.Y, iVertex.Y) and equal(v.Z, iVertex.Z):
-            return index
-
-        index = index + 1
-
-    return -1
+    return getSubIndex(iObj, "Vertex", "Vertex", iVertex)
 
 
 # ###################################################################################################################
@@ -612,14 +709,7 @@ def getEdgeIndex(iObj, iEdge):
 
     """
 
-    index = 1
-    for e in iObj.Shape.Edges:
-        if str(e.BoundBox) == str(iEdge.BoundBox):
-            return index
-
-        index = index + 1
-
-    return -1
+    return getSubIndex(iObj, "Edge", "BoundBox", iEdge.BoundBox)
 
 
 # ###################################################################################################################
@@ -644,14 +734,7 @@ def getEdgeIndexByKey(iObj, iBoundBox):
 
     """
 
-    index = 1
-    for e in iObj.Shape.Edges:
-        if normalizeBoundBox(e.BoundBox) == normalizeBoundBox(iBoundBox):
-            return index
-
-        index = index + 1
-
-    return -1
+    return getSubIndex(iObj, "Edge", "normalized", iBoundBox)
 
 
 # ###################################################################################################################
@@ -802,25 +885,20 @@ def getSubByKey(iObj, iKey, iType, iSubType):
 
     if iType == "BoundBox":
         key = iKey[0]
-        index = 1
 
         if iSubType == "edge":
-            for e in iObj.Shape.Edges:
-                if normalizeBoundBox(e.BoundBox) == normalizeBoundBox(key):
-                    edgeName = "Edge" + str(index)
-                    idx = index - 1
-                    return [e, edgeName, idx]
-
-                index = index + 1
+            index = getSubIndex(iObj, "Edge", "normalized", key)
+            if index != -1:
+                edgeName = "Edge" + str(index)
+                idx = index - 1
+                return [iObj.Shape.Edges[idx], edgeName, idx]
 
         if iSubType == "face":
-            for f in iObj.Shape.Faces:
-                if normalizeBoundBox(f.BoundBox) == normalizeBoundBox(key):
-                    faceName = "Face" + str(index)
-                    idx = index - 1
-                    return [f, faceName, idx]
-
-                index = index + 1
+            index = getSubIndex(iObj, "Face", "normalized", key)
+            if index != -1:
+                faceName = "Face" + str(index)
+                idx = index - 1
+                return [iObj.Shape.Faces[idx], faceName, idx]
 
     return ["", "", ""]
 
@@ -1049,14 +1127,7 @@ def getFaceIndex(iObj, iFace):
 
     """
 
-    index = 1
-    for f in iObj.Shape.Faces:
-        if str(f.BoundBox) == str(iFace.BoundBox):
-            return index
-
-        index = index + 1
-
-    return -1
+    return getSubIndex(iObj, "Face", "BoundBox", iFace.BoundBox)
 
 
 # ###################################################################################################################
@@ -1081,14 +1152,7 @@ def getFaceIndexByKey(iObj, iBoundBox):
 
     """
 
-    index = 1
-    for f in iObj.Shape.Faces:
-        if normalizeBoundBox(f.BoundBox) == normalizeBoundBox(iBoundBox):
-            return index
-
-        index = index + 1
-
-    return -1
+    return getSubIndex(iObj, "Face", "normalized", iBoundBox)
 
 
 # ###################################################################################################################
@@ -1643,66 +1707,79 @@ def getSizes(iObj):
 
 
 # ###################################################################################################################
-def getSizesFromVertices(iObj):
+def getVerticesRange(iShape):
     """
     Description:
 
-            Gets occupied space by the object from vertices.
+            Gets minimum and maximum vertex coordinates of the shape. For closed shape with only planar faces,
+            all edges are straight and the extreme points are at vertices, so the BoundBox is used directly.
+            For other shapes the minimum and maximum values are calculated from vertices coordinates lists.
 
     Args:
 
-            iObj: object
+            iShape: shape, e.g. obj.Shape
 
     Usage:
 
-            [ sx, sy, sz ] = MagicPanels.getSizesFromVertices(obj)
+            [ minX, minY, minZ, maxX, maxY, maxZ ] = MagicPanels.getVerticesRange(obj.Shape)
 
     Result:
 
-            Returns array with [ mX, mY, mZ ] where:
-            mX - occupied space along X axis
-            mY - occupied space along Y axis
-            mZ - occupied space along Z axis
+            Returns array with minimum and maximum vertex coordinates, all 0 if there are no vertices.
 
     """
 
-    init = 0
+    # polyhedron check, any error means the shape is not polyhedron
+    try:
+        isPolyhedron = len(iShape.Faces) > 0 and iShape.isClosed()
 
-    minX = 0
-    minY = 0
-    minZ = 0
+        if isPolyhedron:
+            for f in iShape.Faces:
+                if f.Surface.TypeId != "Part::GeomPlane":
+                    isPolyhedron = False
+                    break
+    except:
+        isPolyhedron = False
 
-    maxX = 0
-    maxY = 0
-    maxZ = 0
+    if isPolyhedron:
+        b = iShape.BoundBox
+        return [b.XMin, b.YMin, b.ZMin, b.XMax, b.YMax, b.ZMax]
 
-    vs = getattr(iObj.Shape, "Vertex" + "es")
+    vs = getattr(iShape, "Vertex" + "es")
 
-    for v in vs:
-        [x, y, z] = [v.X, v.Y, v.Z]
+    if len(vs) == 0:
+        return [0, 0, 0, 0, 0, 0]
 
-        if init == 0:
-            [minX, minY, minZ] = [x, y, z]
-            [maxX, maxY, maxZ] = [x, y, z]
-            init = 1
+    [xs, ys, zs] = zip(*[(v.X, v.Y, v.Z) for v in vs])
 
-        if x > maxX:
-            maxX = x
+    return [min(xs), min(ys), min(zs), max(xs), max(ys), max(zs)]
 
-        if y > maxY:
-            maxY = y
 
-        if z > maxZ:
-            maxZ = z
+# ###################################################################################################################
+def getSizesFromVertices(iObj):
+    """
+    Description:
 
-        if x < minX:
-            minX = x
+            Gets occupied space by the object from vertices.
+
+    Args:
 
-        if y < minY:
-            minY = y
+            iObj: object
+
+    Usage:
+
+            [ sx, sy, sz ] = MagicPanels.getSizesFromVertices(obj)
+
+    Result:
+
+            Returns array with [ mX, mY, mZ ] where:
+            mX - occupied space along X axis
+            mY - occupied space along Y axis
+            mZ - occupied space along Z axis
+
+    """
 
-        if z < minZ:
-            minZ = z
+    [minX, minY, minZ, maxX, maxY, maxZ] = getVerticesRange(iObj.Shape)
 
     s1 = getVertexAxisCross(minX, maxX)
     s2 = getVertexAxisCross(minY, maxY)
@@ -12,11 +12,30 @@ https://github.com/dprojects/Woodworking
 # ###################################################################################################################
 
 
+import array
+import csv
+import html
+import json
+import math
+import os
+import time
+
 import Draft
 import FreeCAD
-import FreeCADGui
 import Spreadsheet
-from PySide import QtCore, QtGui
+
+
+# records cache is not available if getDimensions is used alone, then all objects are scanned each time
+try:
+    import getDimensionsCache
+except:
+    getDimensionsCache = None
+
+
+# Qt GUI is not available at FreeCADCmd
+if FreeCAD.GuiUp:
+    import FreeCADGui
+    from PySide import QtCore, QtGui
 
 
 translate = FreeCAD.Qt.translate
@@ -128,6 +147,19 @@ sARGD = True  # grain direction
 sATS = True  # thickness summary
 sAEI = True  # edgeband info
 
+# Report file:
+# "" - create spreadsheet and TechDraw page
+# path ending with .csv, .json, .md or .html - write report view directly to file,
+# no spreadsheet and no TechDraw page are created
+sReportFile = ""
+
+# Report views from the same scan:
+# "" - only report type set by sLTF
+# report types, for example "qgd" - create all these reports from single document scan,
+# each report view goes to separate spreadsheet "toCut_g" or file "cutlist_g.html",
+# the report type set by sLTF goes to "toCut" or report file as usual
+sViews = ""
+
 
 # ###################################################################################################################
 # Default Settings ( CHANGE HERE IF NEEDED )
@@ -146,7 +178,13 @@ sQT = "yes"
 # 1 - debug mode
 # 0 - keep console clean
 gDEBUG = 0
-gDebugLoop = 0
+
+# PROFILE
+# 1 - record time and calls for report stages, object types and the slowest objects
+# 0 - no profiling
+gProfile = 0
+gProfileTop = 10  # number of the slowest objects to show
+gProfileFile = ""  # path to save profile as .json file, "" - report view only
 
 # ###################################################################################################################
 # Autoconfig - define globals ( NOT CHANGE HERE )
@@ -162,6 +200,28 @@ gOBs = ""
 # currently parsed object called from main loop
 gCallerObj = ""
 
+# quantity multiplier for the currently parsed object
+# arrays and patterns multiply it, so nested arrays are counted as product
+gQty = 1
+
+# currently recorded part records (lists of records)
+gRecords = []
+
+# apply part records to the databases, off while the container is recorded only
+gApply = True
+
+# report types scanned by the current scan, sLTF first
+gViews = ""
+
+# scan steps added by the currently running scan step, None if there is no scan
+gScanPending = None
+
+# scan depth for nested containers and transformations, each nested scan step is one level
+gScanDepth = 1000
+
+# errors collected during the scan
+gErrors = []
+
 # spreadsheet result init
 gSheet = gAD
 
@@ -171,6 +231,35 @@ gSheetRow = 1
 # unit for calculation purposes (not change)
 gUnitC = "mm"
 
+# settings allowed to change via computeCutList
+gSettingsNames = [
+    "sLang",
+    "sRPQ",
+    "sTVF",
+    "sPartCut",
+    "sUnitsMetric",
+    "sLTF",
+    "sUnitsArea",
+    "sUnitsEdge",
+    "sEColor",
+    "sARME",
+    "sARM",
+    "sARP",
+    "sARD",
+    "sARGD",
+    "sATS",
+    "sAEI",
+    "sReportFile",
+    "sViews",
+]
+
+# default settings to restore before each computeCutList call
+gSettingsDefault = {k: globals()[k] for k in gSettingsNames}
+
+# conversion factors from calculation unit
+gUnitL = {"mm": float(1), "m": float(0.001), "in": float(0.0393700787)}  # length
+gUnitA = {"mm": float(1), "m": float(0.000001), "in": float(0.0015500031)}  # area
+
 # header color
 gHeadCS = (0.862745, 0.862745, 0.862745, 1.000000)  # strong
 gHeadCW = (0.941176, 0.941176, 0.941176, 1.000000)  # weak
@@ -209,33 +298,76 @@ gLang26 = ""
 # ###################################################################################################################
 
 
-# init database for Fake Cube
-dbFCO = []  # objects
-dbFCW = dict()  # width
-dbFCH = dict()  # height
-dbFCL = dict()  # length
-
-# init database for dimensions
-dbDQ = dict()  # quantity
-dbDA = dict()  # area
-
-# init database for thickness
-dbTQ = dict()  # quantity
-dbTA = dict()  # area
-
-# init database for edge
-dbE = dict()
-dbE["total"] = 0  # total
-dbE["empty"] = 0  # empty
-dbE["edgeband"] = 0  # edgeband
-
-# init database for face number
-dbEFN = dict()  # array names
-dbEFD = dict()  # array dimensions
-dbEFV = dict()  # array veneers
+# init database for parts, one row for each part and one column for each part property,
+# report views group the rows by columns, so there is no need to create and split string keys
+dbCL = dict()
+dbCL["thick"] = array.array("d")  # thickness
+dbCL["width"] = array.array("d")  # width
+dbCL["length"] = array.array("d")  # length
+dbCL["label"] = []  # object label
+dbCL["group"] = []  # grandparent or parent group label
+dbCL["area"] = array.array("d")  # area without thickness
+dbCL["edge"] = array.array("d")  # total edge size
+dbCL["edgeband"] = array.array("d")  # edgeband edge size
+dbCL["faces"] = []  # edgeband faces [ names, dimensions, veneers ] or empty string
+dbCL["qty"] = array.array("l")  # quantity
+
+# init database for report views, records are used only by this report types
+dbRV = dict()
+dbRV["addDB"] = "qnged"
+dbRV["addDBApproximation"] = "a"
+dbRV["addDBConstraints"] = "c"
+dbRV["addDBHoleConstraints"] = "cd"
+dbRV["addDBAllConstraints"] = "p"
+dbRV["addDBAdditional"] = "qngedcpa"
+
+# init database for furniture parts, the functions are called for objects derived from TypeId
+# with Name starting with prefix, only for the report types and if the setting is True
+# stages: "part" - all objects, "nested" - not for main scan loop, "additional" - additional reports,
+# "transformation" - transformations called for each object at the scan
+dbFP = [
+    # [ stage, TypeId, Name prefix, function, report types, setting ]
+    ["part", "Part::Box", "", "setCube", "qngeda", ""],
+    ["part", "PartDesign::Pad", "", "setPad", "qngeda", ""],
+    ["part", "PartDesign::Pad", "", "setConstraints", "c", ""],
+    ["part", "PartDesign::Pocket", "", "setConstraints", "c", ""],
+    ["part", "PartDesign::Pad", "", "setAllConstraints", "p", ""],
+    ["part", "PartDesign::Pocket", "", "setAllConstraints", "p", ""],
+    ["part", "PartDesign::Hole", "", "setConstraints", "cd", ""],
+    ["nested", "App::Part", "", "setAppPart", "", ""],
+    ["nested", "App::LinkGroup", "", "setAppLinkGroup", "", ""],
+    ["nested", "Part::Cut", "", "setPartCut", "", ""],
+    ["nested", "PartDesign::Body", "Body", "setPartMirroringBody", "", ""],
+    ["nested", "Part::FeaturePython", "Clone", "setDraftClone", "", ""],
+    ["nested", "PartDesign::FeatureBase", "Clone", "setDraftClone", "", ""],
+    ["additional", "App::MeasureDistance", "", "setMeasurementsList", "", "sARME"],
+    ["additional", "Part::Cylinder", "", "setMounting", "", "sARM"],
+    ["additional", "PartDesign::Thickness", "", "setProfiles", "", "sARP"],
+    ["additional", "Part::FeaturePython", "Structure", "setProfiles", "", "sARP"],
+    ["additional", "PartDesign::Fillet", "", "setDecoration", "", "sARD"],
+    ["additional", "PartDesign::Chamfer", "", "setDecoration", "", "sARD"],
+    ["additional", "Part::Sphere", "", "setDecoration", "", "sARD"],
+    ["additional", "Part::Cone", "", "setDecoration", "", "sARD"],
+    ["additional", "Part::Torus", "", "setDecoration", "", "sARD"],
+    ["additional", "", "", "setGrainDirection", "", "sARGD"],
+    ["transformation", "Part::Mirroring", "", "setPartMirroring", "", ""],
+    ["transformation", "Part::FeaturePython", "Array", "setDraftArray", "", ""],
+    ["transformation", "", "Clone", "setDraftClone", "", ""],
+    ["transformation", "PartDesign::Mirrored", "", "setPartDesignMirrored", "", ""],
+    ["transformation", "PartDesign::MultiTransform", "", "setPartDesignMultiTransform", "", ""],
+    ["transformation", "PartDesign::LinearPattern", "", "setPartDesignLinearPattern", "", ""],
+    ["transformation", "App::Link", "", "setAppLink", "", ""],
+]
+
+# init database for furniture parts functions resolved for object type
+dbFH = dict()  # dbFH[(stage, TypeId, Name prefixes)] = list of dbFP entries
+dbFN = sorted(set([e[2] for e in dbFP if e[2] != ""]))  # Name prefixes used by dbFP
+
+# init database for part records of the last scan, dbSR[object name] = list of records
+dbSR = dict()
 
 # init database for constraints
-dbCNO = []  # objects
+dbCNO = []  # objects labels
 dbCNQ = dict()  # quantity
 dbCNN = dict()  # names
 dbCNV = dict()  # values
@@ -248,6 +380,33 @@ dbARQ = dict()  # quantity
 dbARN = dict()  # names
 dbARV = dict()  # values
 
+# init database for visibility, computed once before the scan
+dbVP = dict()  # visibility of nearest parent, dbVP[(document name, object name)] = visibility
+dbVI = dict()  # visibility of highest container, dbVI[(document name, object name)] = visibility
+
+# init database for groups, computed once before the scan
+dbPG = dict()  # parent group, dbPG[(document name, object name)] = group object
+dbLG = dict()  # parent LinkGroup, dbLG[(document name, object name)] = LinkGroup object
+dbGL = dict()  # group label for report, dbGL[(document name, object name)] = label
+
+# init database for faces, cleared for each report so the shape hash is not reused by other shape
+dbFL = dict()  # faces perimeters, dbFL[(document name, object name, shape hash)] = list of faces perimeters
+
+# init database for approximation, cleared for each report as dbFL
+# vertices range, dbAP[(document name, object name, shape hash)] = [ min X, min Y, min Z, max X, max Y, max Z ]
+dbAP = dict()
+
+# init database for containers, LinkGroup or Part linked many times is scanned only once
+dbSM = dict()  # container records, dbSM[(document name, object name, visibility)] = list of [ function, args, qty ]
+
+# init database for profile
+dbPS = dict()  # stages, dbPS[function name] = [ calls, time ]
+dbPT = dict()  # object types, dbPT[TypeId] = [ objects, time ]
+dbPO = []  # objects, list of [ time, label, TypeId ]
+
+# init database for unit formatters
+dbUF = dict()  # formatter for (factor table, unit, precision)
+
 
 # ###################################################################################################################
 # Support for Qt GUI
@@ -790,6 +949,14 @@ def showQtGUI():
 
 # ###################################################################################################################
 def showError(iCaller, iObj, iPlace, iError):
+    # collect error for cut-list API
+    try:
+        vLabel = str(iObj.Label)
+    except:
+        vLabel = str(iObj)
+
+    gErrors.append({"caller": str(iCaller), "object": vLabel, "place": str(iPlace), "error": str(iError)})
+
     if gDEBUG == 1:
         FreeCAD.Console.PrintMessage("\n ====================================================== \n")
 
@@ -817,68 +984,86 @@ def showError(iCaller, iObj, iPlace, iError):
 # ###################################################################################################################
 
 
+# ###################################################################################################################
+def getUnitFormatter(iTable, iUnit, iPrecision, iCaller="getUnitFormatter"):
+    # formatter is created only once for each unit and precision
+    vKey = (iTable, iUnit, iPrecision)
+
+    if vKey in dbUF:
+        return dbUF[vKey]
+
+    if iTable == "area":
+        vFactor = gUnitA.get(iUnit, None)
+    else:
+        vFactor = gUnitL.get(iUnit, None)
+
+    # not supported unit, return -1 the same way as getUnit does for not supported type
+    if vFactor == None:
+
+        def vFormatter(iValue):
+            return -1
+
+    # integer values without decimal part
+    elif iPrecision == 0:
+
+        def vFormatter(iValue):
+            return str(int(round(float(iValue) * vFactor, 0)))
+
+    else:
+
+        def vFormatter(iValue):
+            return str(round(float(iValue) * vFactor, iPrecision))
+
+    dbUF[vKey] = vFormatter
+
+    return vFormatter
+
+
+# ###################################################################################################################
+def getAngle(iValue, iCaller="getAngle"):
+    # convert radians to yaw angle in degrees (-180, 180]
+    v = math.degrees(float(iValue)) % 360
+
+    if v > 180:
+        v = v - 360
+
+    # cut the decimal part, the same way as for the Placement yaw angle
+    return str(int(v))
+
+
 # ###################################################################################################################
 def getUnit(iValue, iType, iCaller="getUnit"):
     # for dimensions
     if iType == "d":
-        gFakeCube.Length = float(iValue)
-        v = gFakeCube.Length.getValueAs(gUnitC).Value
-
         if sUnitsMetric == "mm":
-            return str(int(round(v, 0)))
-
-        if sUnitsMetric == "m":
-            return str(round(v * float(0.001), 3))
+            return getUnitFormatter("length", sUnitsMetric, 0)(iValue)
 
-        if sUnitsMetric == "in":
-            return str(round(v * float(0.0393700787), 3))
+        return getUnitFormatter("length", sUnitsMetric, 3)(iValue)
 
     # for dimensions
     if iType == "f":
-        gFakeCube.Length = float(iValue)
-        v = gFakeCube.Length.getValueAs(gUnitC).Value
-
         if sUnitsMetric == "mm":
-            return str(round(v, 1))
-
-        if sUnitsMetric == "m":
-            return str(round(v * float(0.001), 3))
+            return getUnitFormatter("length", sUnitsMetric, 1)(iValue)
 
-        if sUnitsMetric == "in":
-            return str(round(v * float(0.0393700787), 3))
+        return getUnitFormatter("length", sUnitsMetric, 3)(iValue)
 
     # for edge
     if iType == "edge":
-        gFakeCube.Length = float(iValue)
-        v = gFakeCube.Length.getValueAs(gUnitC).Value
-
         if sUnitsEdge == "mm":
-            return str(int(round(v, 0)))
-
-        if sUnitsEdge == "m":
-            return str(round(v * float(0.001), 3))
+            return getUnitFormatter("length", sUnitsEdge, 0)(iValue)
 
-        if sUnitsEdge == "in":
-            return str(round(v * float(0.0393700787), 3))
+        return getUnitFormatter("length", sUnitsEdge, 3)(iValue)
 
     # for area
     if iType == "area":
-        gFakeCube.Length = float(iValue)
-        v = gFakeCube.Length.getValueAs(gUnitC).Value
-
         if sUnitsArea == "mm":
-            return str(int(round(v, 0)))
-
-        if sUnitsArea == "m":
-            return str(round(v * float(0.000001), 6))
+            return getUnitFormatter("area", sUnitsArea, 0)(iValue)
 
-        if sUnitsArea == "in":
-            return str(round(v * float(0.0015500031), 6))
+        return getUnitFormatter("area", sUnitsArea, 6)(iValue)
 
     # for to-angle conversion
     if iType == "to-angle":
-        gFakeCube.Placement.Rotation.Angle = float(iValue)
-        return str(int(gFakeCube.Placement.Rotation.getYawPitchRoll()[0]))
+        return getAngle(iValue, iCaller)
 
     return -1
 
@@ -940,44 +1125,52 @@ def switchApproximation(iA, iB, iCaller="switchApproximation"):
 
 
 # ###################################################################################################################
-def getApproximation(iObj, iCaller="getApproximation"):
-    init = 0
+def isPolyhedron(iShape, iCaller="isPolyhedron"):
+    # closed shape with only planar faces has straight edges only,
+    # so the extreme points are at vertices and the BoundBox is exact
+    try:
+        if len(iShape.Faces) == 0 or not iShape.isClosed():
+            return False
 
-    minX = 0
-    minY = 0
-    minZ = 0
+        for f in iShape.Faces:
+            if f.Surface.TypeId != "Part::GeomPlane":
+                return False
 
-    maxX = 0
-    maxY = 0
-    maxZ = 0
+    except:
+        return False
+
+    return True
 
-    vs = getattr(iObj.Shape, "Vertex" + "es")
 
-    for v in vs:
-        [x, y, z] = [v.X, v.Y, v.Z]
+# ###################################################################################################################
+def getVerticesRange(iObj, iCaller="getVerticesRange"):
+    vShape = iObj.Shape
+    vKey = getObjectKey(iObj) + (vShape.hashCode(),)
+
+    # calculate only once for each shape
+    if vKey in dbAP:
+        return dbAP[vKey]
 
-        if init == 0:
-            [minX, minY, minZ] = [x, y, z]
-            [maxX, maxY, maxZ] = [x, y, z]
-            init = 1
+    if isPolyhedron(vShape, iCaller):
+        b = vShape.BoundBox
+        vRange = [b.XMin, b.YMin, b.ZMin, b.XMax, b.YMax, b.ZMax]
 
-        if x > maxX:
-            maxX = x
+    else:
+        vs = getattr(vShape, "Vertex" + "es")
+        vRange = [0, 0, 0, 0, 0, 0]
 
-        if y > maxY:
-            maxY = y
+        if len(vs) > 0:
+            [xs, ys, zs] = zip(*[(v.X, v.Y, v.Z) for v in vs])
+            vRange = [min(xs), min(ys), min(zs), max(xs), max(ys), max(zs)]
 
-        if z > maxZ:
-            maxZ = z
+    dbAP[vKey] = vRange
 
-        if x < minX:
-            minX = x
+    return vRange
 
-        if y < minY:
-            minY = y
 
-        if z < minZ:
-            minZ = z
+# ###################################################################################################################
+def getApproximation(iObj, iCaller="getApproximation"):
+    [minX, minY, minZ, maxX, maxY, maxZ] = getVerticesRange(iObj, iCaller)
 
     s1 = switchApproximation(minX, maxX, iCaller)
     s2 = switchApproximation(minY, maxY, iCaller)
@@ -990,20 +1183,114 @@ def getApproximation(iObj, iCaller="getApproximation"):
     s = [mWidth, mDepth, mHeight]
     s.sort()
 
-    key = ""
-    key += str(round(s[0], 2))
-    key += ":"
-    key += str(round(s[1], 2))
-    key += ":"
-    key += str(round(s[2], 2))
-    key += ":"
-    key += str(getGroup(iObj, iCaller))
+    group = str(getGroup(iObj, iCaller))
+
+    return [group, s[0], s[1], s[2]]
+
+
+# ###################################################################################################################
+def getObjectKey(iObj, iCaller="getObjectKey"):
+    # objects from linked documents may have the same name
+    return (iObj.Document.Name, iObj.Name)
+
+
+# ###################################################################################################################
+def setGroups(iOBs, iCaller="setGroups"):
+    # index of parent groups, so there is no need to search parents for each object
+    dbPG.clear()
+    dbLG.clear()
+    dbGL.clear()
+
+    for o in iOBs:
+        try:
+            if o.isDerivedFrom("App::LinkGroup"):
+                vDB = dbLG
+                vContent = o.ElementList
+
+            elif o.hasExtension("App::GroupExtension"):
+                vDB = dbPG
+                vContent = o.Group
+
+            else:
+                continue
+
+            for c in vContent:
+                vKey = getObjectKey(c)
+
+                # object can be only in one group
+                if vKey not in vDB:
+                    vDB[vKey] = o
+
+        except:
+            skip = 1
+
+    return 0
+
+
+# ###################################################################################################################
+def getGroupFromIndex(iObj, iCaller="getGroupFromIndex"):
+    # init variable
+    vGroup = ""
+
+    # support for Pad and Pocket, the highest container of the Sketch
+    if iObj.isDerivedFrom("PartDesign::Pad") or iObj.isDerivedFrom("PartDesign::Pocket"):
+        try:
+            vParent = dbPG.get(getObjectKey(iObj.Profile[0]))
+        except:
+            vParent = None
+
+        while vParent != None:
+            vGroup = vParent.Label
+            vParent = dbPG.get(getObjectKey(vParent))
+
+    # support for Cube and other calls, grandparent or parent
+    else:
+        vParent = dbPG.get(getObjectKey(iObj))
+
+        if vParent != None:
+            vGrandParent = dbPG.get(getObjectKey(vParent))
 
-    return [key, s[0], s[1], s[2]]
+            if vGrandParent != None:
+                vGroup = vGrandParent.Label
+            else:
+                vGroup = vParent.Label
+
+    # get parent for LinkGroup, grandparent or parent
+    if vGroup == "":
+        vParent = dbLG.get(getObjectKey(iObj))
+
+        if vParent != None:
+            vGrandParent = dbLG.get(getObjectKey(vParent))
+
+            if vGrandParent != None:
+                vGroup = vGrandParent.Label
+            else:
+                vGroup = vParent.Label
+
+    return vGroup
 
 
 # ###################################################################################################################
 def getGroup(iObj, iCaller="getGroup"):
+    vKey = getObjectKey(iObj)
+
+    # group label is searched only once for each object
+    if vKey in dbGL:
+        return dbGL[vKey]
+
+    vGroup = getGroupFromIndex(iObj, iCaller)
+
+    # objects not in index, for example from other documents
+    if vGroup == "":
+        vGroup = getGroupFromParents(iObj, iCaller)
+
+    dbGL[vKey] = vGroup
+
+    return vGroup
+
+
+# ###################################################################################################################
+def getGroupFromParents(iObj, iCaller="getGroupFromParents"):
     # init variable
     vGroup = ""
 
@@ -1061,33 +1348,11 @@ def getKey(iObj, iW, iH, iL, iType, iCaller="getKey"):
     # sort as values to have thickness first
     vKeyArr.sort()
 
-    # create key string with thickness first
-    vKey = ""
-    vKey += str(vKeyArr[0])
-    vKey += ":"
-    vKey += str(vKeyArr[1])
-    vKey += ":"
-    vKey += str(vKeyArr[2])
-
-    # key for name report
-    if iType == "d" and (sLTF == "n" or sLTF == "e" or sLTF == "d"):
-        vKey = str(vKey) + ":" + str(iObj.Label)
-
-    # key for group report
-    if iType == "d" and (sLTF == "g" or sLTF == "d"):
-        # get grandparent or parent group name
-        vGroup = getGroup(iObj, iCaller)
-
-        if vGroup != "":
-            vKey = str(vKey) + ":" + str(vGroup)
-        else:
-            vKey = str(vKey) + ":[...]"
-
     # return thickness (this is value, not string)
     if iType == "thick":
         return vKeyArr[0]
 
-    return str(vKey)
+    return -1
 
 
 # ###################################################################################################################
@@ -1136,62 +1401,66 @@ def getEdge(iObj, iW, iH, iL, iCaller="getEdge"):
     return vEdge
 
 
+# ###################################################################################################################
+def getFacesLength(iObj, iCaller="getFacesLength"):
+    # read faces perimeters only once for each shape
+    vShape = iObj.Shape
+    vKey = getObjectKey(iObj) + (vShape.hashCode(),)
+
+    if vKey not in dbFL:
+        dbFL[vKey] = [f.Length for f in vShape.Faces]
+
+    return dbFL[vKey]
+
+
 # ###################################################################################################################
 def getEdgeBand(iObj, iW, iH, iL, iCaller="getEdgeBand"):
     try:
         # get faces colors
         vFacesColors = iObj.ViewObject.DiffuseColor
-        vObjColor = iObj.ViewObject.ShapeColor
+        vObjColor = str(iObj.ViewObject.ShapeColor)
 
         # edgeband for given object
         vEdgeSum = 0
 
         # there can be more faces than 6 (Array Cube)
-        vFaceN = []
-        vFaceD = []
-        vFaceV = []
+        vFaceN = [""] * len(vFacesColors)
+        vFaceD = [0] * len(vFacesColors)
+        vFaceV = [""] * len(vFacesColors)
 
-        # search for edgeband
-        i = 0
-        for c in vFacesColors:
-            # there can be more faces than 6 (Array Cube)
-            vFaceN.insert(i, "")
-            vFaceD.insert(i, 0)
-            vFaceV.insert(i, "")
-
-            # if the edge face color is different than object color,
-            # it means this is edgeband added by the user
-            if str(c) != str(vObjColor):
-                vFaceEdge = iObj.Shape.Faces[i].Length
-
-                # get the thickness dimension
-                vT = getKey(iObj, iW, iH, iL, "thick", iCaller)
-
-                # if you know the thickness you can
-                # calculate the edge for the face
-                vEdge = (vFaceEdge - (2 * vT)) / 2
-
-                # sort thickness
-                a = [iW, iH, iL]
-                a.sort()
-
-                # check if this is correct edge
-                if int(vEdge) == int(a[1]) or int(vEdge) == int(a[2]):
-                    vFaceN[i] = gLang12
-                    vFaceD[i] = vEdge
-                    vFaceV[i] = str(sEColor)
+        # if the edge face color is different than object color,
+        # it means this is edgeband added by the user
+        vEdgeBand = [i for i, c in enumerate(vFacesColors) if str(c) != vObjColor]
 
-                else:
-                    vFaceN[i] = gLang13
-                    vFaceD[i] = -1
-                    vFaceV[i] = str(sEColor)
-                    vEdge = 0
+        if len(vEdgeBand) == 0:
+            return [vEdgeSum, vFaceN, vFaceD, vFaceV]
 
-                # add all faces to edge size
-                vEdgeSum = vEdgeSum + vEdge
+        # get faces perimeters
+        vFacesLength = getFacesLength(iObj, iCaller)
 
-            # next face index
-            i = i + 1
+        # sort sizes to have the thickness first
+        a = sorted([iW, iH, iL])
+        vT = a[0]
+
+        for i in vEdgeBand:
+            # if you know the thickness you can
+            # calculate the edge for the face
+            vEdge = (vFacesLength[i] - (2 * vT)) / 2
+
+            # check if this is correct edge
+            if int(vEdge) == int(a[1]) or int(vEdge) == int(a[2]):
+                vFaceN[i] = gLang12
+                vFaceD[i] = vEdge
+                vFaceV[i] = str(sEColor)
+
+            else:
+                vFaceN[i] = gLang13
+                vFaceD[i] = -1
+                vFaceV[i] = str(sEColor)
+                vEdge = 0
+
+            # add all faces to edge size
+            vEdgeSum = vEdgeSum + vEdge
 
     except:
         # get edgeband error
@@ -1222,6 +1491,195 @@ def getConstraintName(iObj, iName, iCaller="getConstraintName"):
     return str(iName)
 
 
+# ###################################################################################################################
+# Database records - change db only via this functions
+# ###################################################################################################################
+
+
+# ###################################################################################################################
+def setRecord(iFunction, iArgs, iCaller="setRecord"):
+    # apply the record to the databases
+    if gApply == True:
+        globals()[iFunction](*iArgs)
+
+    # remember the record for incremental update, records store only
+    # plain values, so they can be applied again without the object scan
+    for r in gRecords:
+        r.append((iFunction, iArgs))
+
+    return 0
+
+
+# ###################################################################################################################
+def setRecords(iRecords, iCaller="setRecords"):
+    for r in iRecords:
+        setRecord(r[0], r[1], iCaller)
+
+    return 0
+
+
+# ###################################################################################################################
+def addDB(iLabel, iGroup, iT, iW, iL, iArea, iEdge, iEdgeBand, iFaces, iQty):
+    # add part row
+    dbCL["thick"].append(iT)
+    dbCL["width"].append(iW)
+    dbCL["length"].append(iL)
+    dbCL["label"].append(iLabel)
+    dbCL["group"].append(iGroup)
+    dbCL["area"].append(iArea)
+    dbCL["edge"].append(iEdge)
+    dbCL["edgeband"].append(iEdgeBand)
+    dbCL["faces"].append(iFaces)
+    dbCL["qty"].append(iQty)
+
+
+# ###################################################################################################################
+def addDBApproximation(iGroup, iT, iW, iL, iQty):
+    # add part row without area and edge
+    addDB("", iGroup, iT, iW, iL, 0, 0, 0, "", iQty)
+
+
+# ###################################################################################################################
+def addDBConstraints(iKey, iL, iN, iV, iHoleObj, iHeader, iQty):
+    # set quantity
+    if iKey in dbCNQ:
+        # increase quantity only
+        dbCNQ[iKey] = dbCNQ[iKey] + iQty
+
+        # show only one object at report
+        return
+
+    # init quantity
+    dbCNQ[iKey] = iQty
+
+    # add object with no empty constraints names
+    dbCNO.append(iKey)
+
+    # set length, names, values
+    dbCNL[iKey] = iL
+    dbCNN[iKey] = iN
+    dbCNV[iKey] = iV
+
+    # set holes for detailed report
+    if sLTF == "d":
+        try:
+            dbCNOH[str(iHoleObj)] += str(iKey) + ":"
+        except:
+            dbCNOH[str(iHoleObj)] = str(iKey) + ":"
+
+    # constraints report header for Length
+    if iHeader != "":
+        dbCNH[iKey] = iHeader
+
+
+# ###################################################################################################################
+def addDBHoleConstraints(iKey, iL, iN, iV, iHoleObj, iHeader, iQty):
+    # holes are used also by detailed report
+    addDBConstraints(iKey, iL, iN, iV, iHoleObj, iHeader, iQty)
+
+
+# ###################################################################################################################
+def addDBAllConstraints(iKey, iL, iN, iV, iHeader, iQty):
+    # set quantity
+    if iKey in dbCNQ:
+        # increase quantity only
+        dbCNQ[iKey] = dbCNQ[iKey] + iQty
+
+        # show only one object at report
+        return
+
+    # init quantity
+    dbCNQ[iKey] = iQty
+
+    # set names and values
+    dbCNN[iKey] = iN
+    dbCNV[iKey] = iV
+
+    # set length
+    dbCNL[iKey] = iL
+    dbCNH[iKey] = iHeader
+
+
+# ###################################################################################################################
+def addDBAdditional(iKey, iN, iV, iAppend, iQty):
+    # set quantity
+    if iKey in dbARQ:
+        # increase quantity only
+        dbARQ[iKey] = dbARQ[iKey] + iQty
+
+        # show only one object at report if there is no custom key
+        # add names and values to existing entry if there is custom key
+        if iAppend == True:
+            dbARN[iKey] = dbARN[iKey] + ":" + iN
+            dbARV[iKey] = dbARV[iKey] + ":" + iV
+
+        return
+
+    dbARQ[iKey] = iQty
+
+    # set names and values
+    dbARN[iKey] = iN
+    dbARV[iKey] = iV
+
+
+# ###################################################################################################################
+# Database queries - get parts only via this functions
+# ###################################################################################################################
+
+
+# ###################################################################################################################
+def getDBColumns(iCaller="getDBColumns"):
+    # columns to group parts for main report
+    vColumns = ["thick", "width", "length"]
+
+    if sLTF == "n" or sLTF == "e" or sLTF == "d":
+        vColumns.append("label")
+
+    if sLTF == "g" or sLTF == "d" or sLTF == "a":
+        vColumns.append("group")
+
+    return vColumns
+
+
+# ###################################################################################################################
+def getDBGroups(iColumns, iCaller="getDBGroups"):
+    # groups are in order of the first part added
+    vGroups = dict()
+
+    vQty = dbCL["qty"]
+    vArea = dbCL["area"]
+    vFaces = dbCL["faces"]
+
+    for i, vKey in enumerate(zip(*[dbCL[c] for c in iColumns])):
+        if vKey not in vGroups:
+            vGroup = dict(zip(iColumns, vKey))
+            vGroup["qty"] = 0
+            vGroup["area"] = 0
+            vGroup["faces"] = ""
+            vGroups[vKey] = vGroup
+
+        vGroup = vGroups[vKey]
+        vGroup["qty"] = vGroup["qty"] + vQty[i]
+        vGroup["area"] = vGroup["area"] + (vArea[i] * vQty[i])
+
+        # show the last part edgeband faces
+        if vFaces[i] != "":
+            vGroup["faces"] = vFaces[i]
+
+    return list(vGroups.values())
+
+
+# ###################################################################################################################
+def getDBSum(iColumn, iCaller="getDBSum"):
+    # sum of column values for all parts
+    vSum = 0
+
+    for v, q in zip(dbCL[iColumn], dbCL["qty"]):
+        vSum = vSum + (v * q)
+
+    return vSum
+
+
 # ###################################################################################################################
 # Database controllers - set db only via this controllers
 # ###################################################################################################################
@@ -1230,61 +1688,50 @@ def getConstraintName(iObj, iName, iCaller="getConstraintName"):
 # ###################################################################################################################
 def setDB(iObj, iW, iH, iL, iCaller="setDB"):
     try:
-        # set db for Fake Cube Object
-        dbFCO.append(iObj)
-
-        # set db for Fake Cube dimensions
-        dbFCW[iObj.Label] = iW
-        dbFCH[iObj.Label] = iH
-        dbFCL[iObj.Label] = iL
-
         # get area for object
         vArea = getArea(iObj, iW, iH, iL, iCaller)
 
-        # get key  for object
-        vKey = getKey(iObj, iW, iH, iL, "d", iCaller)
+        # sort dimensions to have thickness first
+        [vT, vW, vL] = sorted([iW, iH, iL])
 
-        # set dimensions db for quantity & area
-        if vKey in dbDQ:
-            dbDQ[vKey] = dbDQ[vKey] + 1
-            dbDA[vKey] = dbDA[vKey] + vArea
-        else:
-            dbDQ[vKey] = 1
-            dbDA[vKey] = vArea
+        # get grandparent or parent group name only if report needs it
+        vGroup = ""
+        if isView("gd"):
+            vGroup = getGroup(iObj, iCaller)
 
-        # get key  for object (convert value to dimension string)
-        vKeyT = str(getKey(iObj, iW, iH, iL, "thick", iCaller))
+            if vGroup == "":
+                vGroup = "[...]"
 
-        # set thickness db for quantity & area
-        if vKeyT in dbTQ:
-            dbTQ[vKeyT] = dbTQ[vKeyT] + 1
-            dbTA[vKeyT] = dbTA[vKeyT] + vArea
-        else:
-            dbTQ[vKeyT] = 1
-            dbTA[vKeyT] = vArea
+        # edge size and edgeband faces
+        vEdge = 0
+        vEdgeBand = 0
+        vFaces = ""
 
         # check visibility for edge if visibility feature is "edge"
         # if visibility feature is "on" the whole object is skipped
         # so never run this part for such object
         vSkip = 0
         if sTVF == "edge":
-            if FreeCADGui.ActiveDocument.getObject(iObj.Name).Visibility == False:
+            if iObj.Visibility == False:
                 vSkip = 1
 
         # if object is not visible not calculate the edge
         if vSkip == 0:
-            # set edge db for total edge size
+            # get total edge size
             vEdge = getEdge(iObj, iW, iH, iL, iCaller)
-            dbE["total"] = dbE["total"] + vEdge
 
-            # if color faces, not whole object color
-            if len(iObj.ViewObject.DiffuseColor) != 1:
-                # set edge db for edgeband edge size & faces
-                vEdge, dbEFN[vKey], dbEFD[vKey], dbEFV[vKey] = getEdgeBand(iObj, iW, iH, iL, iCaller)
-                dbE["edgeband"] = dbE["edgeband"] + vEdge
+            # if color faces, not whole object color (no colors at FreeCADCmd)
+            if iObj.ViewObject != None and len(iObj.ViewObject.DiffuseColor) != 1:
+                # get edgeband edge size & faces
+                vRes = getEdgeBand(iObj, iW, iH, iL, iCaller)
+
+                if vRes != -1:
+                    vEdgeBand = vRes[0]
+                    vFaces = [vRes[1], vRes[2], vRes[3]]
 
-            # set edge db for empty edge size
-            dbE["empty"] = dbE["total"] - dbE["edgeband"]
+        # set db for quantity & area & edge size
+        vArgs = [str(iObj.Label), vGroup, vT, vW, vL, vArea, vEdge, vEdgeBand, vFaces, gQty]
+        setRecord("addDB", vArgs, iCaller)
 
     except:
         # set db error
@@ -1297,17 +1744,13 @@ def setDB(iObj, iW, iH, iL, iCaller="setDB"):
 # ###################################################################################################################
 def setDBApproximation(iObj, iCaller="setDBApproximation"):
     try:
-        [vKey, thick, s1, s2] = getApproximation(iObj, iCaller)
+        [vGroup, thick, s1, s2] = getApproximation(iObj, iCaller)
 
         if thick <= 0 or s1 <= 0 or s2 <= 0:
             raise
 
         # set dimensions db
-        if vKey in dbDQ:
-            dbDQ[vKey] = dbDQ[vKey] + 1
-
-        else:
-            dbDQ[vKey] = 1
+        setRecord("addDBApproximation", [vGroup, thick, s1, s2, gQty], iCaller)
 
     except:
         # set db error
@@ -1325,38 +1768,22 @@ def setDBConstraints(iObj, iL, iN, iV, iHoleObj, iCaller="setDBConstraints"):
         # set key
         vKey = iObj.Label
 
-        # set quantity
-        if vKey in dbCNQ:
-            # increase quantity only
-            dbCNQ[vKey] = dbCNQ[vKey] + 1
-
-            # show only one object at report
-            return 0
-
-        # init quantity
-        dbCNQ[vKey] = 1
-
-        # add object with no empty constraints names
-        dbCNO.append(iObj)
+        # constraints report header for Length
+        vHeader = ""
 
-        # set length, names, values
-        dbCNL[vKey] = iL
-        dbCNN[vKey] = iN
-        dbCNV[vKey] = iV
+        if iObj.isDerivedFrom("PartDesign::Pad"):
+            vHeader = gLang9
 
-        # set holes for detailed report
-        if sLTF == "d":
-            try:
-                dbCNOH[str(iHoleObj)] += str(vKey) + ":"
-            except:
-                dbCNOH[str(iHoleObj)] = str(vKey) + ":"
+        if iObj.isDerivedFrom("PartDesign::Hole"):
+            vHeader = gLang15
 
-        # constraints report header for Length
-        if iObj.isDerivedFrom("PartDesign::Pad"):
-            dbCNH[vKey] = gLang9
+        # set db for constraints
+        vArgs = [vKey, iL, iN, iV, iHoleObj, vHeader, gQty]
 
         if iObj.isDerivedFrom("PartDesign::Hole"):
-            dbCNH[vKey] = gLang15
+            setRecord("addDBHoleConstraints", vArgs, iCaller)
+        else:
+            setRecord("addDBConstraints", vArgs, iCaller)
 
     except:
         # set db error
@@ -1382,24 +1809,13 @@ def setDBAllConstraints(iObj, iL, iN, iV, iCaller="setDBAllConstraints"):
         vKey += ":" + vVal
         vKey += ":" + iL
 
-        # set quantity
-        if vKey in dbCNQ:
-            # increase quantity only
-            dbCNQ[vKey] = dbCNQ[vKey] + 1
-
-            # show only one object at report
-            return 0
-
-        # init quantity
-        dbCNQ[vKey] = 1
-
         # set names and values
-        dbCNN[vKey] = str(":".join(map(str, iN)))
-        dbCNV[vKey] = str(":".join(map(str, iV)))
+        vN = str(":".join(map(str, iN)))
+        vV = str(":".join(map(str, iV)))
 
-        # set length
-        dbCNL[vKey] = iL
-        dbCNH[vKey] = gLang9
+        # set db for constraints
+        vArgs = [vKey, iL, vN, vV, gLang9, gQty]
+        setRecord("addDBAllConstraints", vArgs, iCaller)
 
     except:
         # set db error
@@ -1428,26 +1844,10 @@ def setDBAdditional(iObj, iType, iN, iV, iKey="", iCaller="setDBAdditional"):
                 vKey = iType
                 vKey += ":" + vV
 
-        # set quantity
-        if vKey in dbARQ:
-            # increase quantity only
-            dbARQ[vKey] = dbARQ[vKey] + 1
-
-            # show only one object at report if there is no custom key
-            # update existing entry if there is custom key
-            if iKey == "":
-                return 0
-            else:
-                # set names and values
-                dbARN[vKey] = str(":".join(map(str, iN)))
-                dbARV[vKey] = vV
-                return 0
-
-        dbARQ[vKey] = 1
-
-        # set names and values
-        dbARN[vKey] = str(":".join(map(str, iN)))
-        dbARV[vKey] = vV
+        # set names and values, for custom key add them to existing entry
+        vN = str(":".join(map(str, iN)))
+        vArgs = [vKey, vN, vV, iKey != "", gQty]
+        setRecord("addDBAdditional", vArgs, iCaller)
 
     except:
         # set db error
@@ -1465,10 +1865,10 @@ def setDBAdditional(iObj, iType, iN, iV, iKey="", iCaller="setDBAdditional"):
 # ###################################################################################################################
 def setCube(iObj, iCaller="setCube"):
     try:
-        if sLTF == "a":
+        if isView("a"):
             setDBApproximation(iObj, iCaller)
 
-        else:
+        if isView("qnged"):
             # get correct dimensions as values
             vW = iObj.Width.Value
             vH = iObj.Height.Value
@@ -1488,10 +1888,10 @@ def setCube(iObj, iCaller="setCube"):
 # ###################################################################################################################
 def setPad(iObj, iCaller="setPad"):
     try:
-        if sLTF == "a":
+        if isView("a"):
             setDBApproximation(iObj, iCaller)
 
-        else:
+        if isView("qnged"):
             # get values
             vW = iObj.Profile[0].Shape.OrderedEdges[0].Length
             vH = iObj.Profile[0].Shape.OrderedEdges[1].Length
@@ -1553,7 +1953,7 @@ def setConstraints(iObj, iCaller="setConstraints"):
                     vLength = ""
 
                 # detailed report for holes
-                if sLTF == "d":
+                if isView("d"):
                     try:
                         # set reference point until will be something
                         # different than hole
@@ -1880,12 +2280,7 @@ def setMeasurementsList(iObj, iCaller="setMeasurementsList"):
             # set key
             vType = gLang23 + ", " + n
 
-            # add existing entries
-            if vType in dbARN.keys():
-                vArrNames.append(dbARN[vType])
-                vArrValues.append(dbARV[vType])
-
-            # add new entry
+            # add new entry, existing entries are kept for custom key
 
             # set name for entry
             v = str(sub)
@@ -1954,86 +2349,222 @@ def setGrainDirection(iObj, iCaller="setGrainDirection"):
 
 
 # ###################################################################################################################
-def selectFurniturePart(iObj, iCaller="selectFurniturePart"):
-    # normal reports
-    if sLTF != "c" and sLTF != "p":
-        # support for Cube furniture part
-        if iObj.isDerivedFrom("Part::Box"):
-            setCube(iObj, iCaller)
+def registerFurniturePart(iStage, iType, iPrefix, iFunction, iViews="", iSetting=""):
+    """
+    Description:
 
-        # support for Pad furniture part
-        if iObj.isDerivedFrom("PartDesign::Pad"):
-            setPad(iObj, iCaller)
+        Adds support for new furniture part type. The function is called for each scanned object
+        derived from given TypeId with Name starting with given prefix.
 
-    # constraints reports
-    else:
-        # only named constraints
-        if sLTF == "c":
-            if iObj.isDerivedFrom("PartDesign::Pad") or iObj.isDerivedFrom("PartDesign::Pocket"):
-                setConstraints(iObj, iCaller)
-
-        # pads (all constraints)
-        if sLTF == "p":
-            if iObj.isDerivedFrom("PartDesign::Pad") or iObj.isDerivedFrom("PartDesign::Pocket"):
-                setAllConstraints(iObj, iCaller)
-
-    # constraints or detailed
-    if sLTF == "c" or sLTF == "d":
-        # support for pilot holes and countersinks
-        if iObj.isDerivedFrom("PartDesign::Hole"):
-            setConstraints(iObj, iCaller)
+        The registration is kept only until getDimensions is loaded again, and the toolbar
+        loads it again each time. So use it from a script at FreeCADCmd, before computeCutList
+        or writeCutList, at the same getDimensions module.
 
-    # all reports, skip main scan loop
-    if iCaller != "main":
-        # support for Part but called only from LinkGroup or Link
-        if iObj.isDerivedFrom("App::Part"):
-            setAppPart(iObj, iCaller)
+    Args:
+
+        iStage: "part" - all objects, "nested" - objects from LinkGroup, Link or transformations,
+                "additional" - additional reports, "transformation" - transformations
+        iType: TypeId the object is derived from, "" for all types
+        iPrefix: object Name prefix, "" for all names
+        iFunction: function name at getDimensions or function, called with (iObj, iCaller),
+                   for "transformation" stage called with (iObj) only
+        iViews: report types the function is called for, "" for all
+        iSetting: setting name, the function is called only if the setting is True, "" for always
+
+    Usage:
+
+        # script run by FreeCADCmd, import at FreeCAD GUI also runs the macro with Qt GUI
+        import FreeCAD
+        import getDimensions
+
+        def setDowel(iObj, iCaller="setDowel"):
+            getDimensions.setDB(iObj, iObj.Radius.Value * 2, iObj.Radius.Value * 2, iObj.Height.Value, iCaller)
+
+        getDimensions.registerFurniturePart("part", "Part::Cylinder", "Dowel", setDowel, "qnged")
+        result = getDimensions.computeCutList(FreeCAD.openDocument("/tmp/cabinet.FCStd"), {"sLTF": "n"})
+
+    Result:
+
+        return 0
 
-        # support for LinkGroup but called only from transformations
-        if iObj.isDerivedFrom("App::LinkGroup"):
-            setAppLinkGroup(iObj, iCaller)
+    """
 
-        # support for Cut but called only from transformations
-        if iObj.isDerivedFrom("Part::Cut"):
-            setPartCut(iObj, iCaller)
+    # the function is kept at the entry, so it never replaces getDimensions function with the same name
+    dbFP.append([iStage, iType, iPrefix, iFunction, iViews, iSetting])
+    dbFH.clear()
 
-        # support for Mirror on Body
-        if iObj.isDerivedFrom("PartDesign::Body") and iObj.Name.startswith("Body"):
-            setPartMirroringBody(iObj, iCaller)
+    # records of the previous report were created without the new function
+    if getDimensionsCache != None:
+        getDimensionsCache.clearAllRecords()
 
-        # support for Mirror on Clone
-        if iObj.isDerivedFrom("Part::FeaturePython") and iObj.Name.startswith("Clone"):
-            setDraftClone(iObj, iCaller)
+    if iPrefix != "" and iPrefix not in dbFN:
+        dbFN.append(iPrefix)
 
-        # support for Clone as PartDesign :: FeatureBase
-        if iObj.isDerivedFrom("PartDesign::FeatureBase") and iObj.Name.startswith("Clone"):
-            setDraftClone(iObj, iCaller)
+    return 0
+
+
+# ###################################################################################################################
+def getFunction(iFunction):
+    # function name at getDimensions or function registered by registerFurniturePart
+    if callable(iFunction):
+        return iFunction
 
-    # additional report - measurements
-    if sARME == True:
-        setMeasurementsList(iObj, iCaller)
+    return globals()[iFunction]
 
-    # additional report - mounting
-    if sARM == True:
-        setMounting(iObj, iCaller)
 
-    # additional report - profiles
-    if sARP == True:
-        setProfiles(iObj, iCaller)
+# ###################################################################################################################
+def getFunctionName(iFunction):
+    return str(getattr(iFunction, "__name__", iFunction))
+
 
-    # additional report - decoration
-    if sARD == True:
-        setDecoration(iObj, iCaller)
+# ###################################################################################################################
+def getFurniturePartFunctions(iObj, iStage, iCaller="getFurniturePartFunctions"):
+    # functions for object type and Name prefix are resolved only once
+    vPrefixes = tuple([p for p in dbFN if iObj.Name.startswith(p)])
+    vKey = (iStage, str(iObj.TypeId), vPrefixes)
 
-    # additional report - grain direction
-    if sARGD == True:
-        setGrainDirection(iObj, iCaller)
+    if vKey not in dbFH:
+        dbFH[vKey] = []
+
+        for e in dbFP:
+            if e[0] != iStage:
+                continue
+
+            if e[2] != "" and e[2] not in vPrefixes:
+                continue
+
+            if e[1] != "" and not iObj.isDerivedFrom(e[1]):
+                continue
+
+            dbFH[vKey].append(e)
+
+    # report types and settings can be changed between scans
+    vFunctions = []
+    for e in dbFH[vKey]:
+        if e[4] != "" and not isView(e[4]):
+            continue
+
+        if e[5] != "" and globals()[e[5]] != True:
+            continue
+
+        vFunctions.append(e[3])
+
+    return vFunctions
+
+
+# ###################################################################################################################
+def selectFurniturePart(iObj, iCaller="selectFurniturePart"):
+    # the part is set by the scan after the current scan step, so nested parts keep the tree order
+    setScanStep("setFurniturePart", [iObj, iCaller], iCaller)
+
+    return 0
+
+
+# ###################################################################################################################
+def setFurniturePart(iObj, iCaller="setFurniturePart"):
+    # normal reports and constraints reports
+    for f in getFurniturePartFunctions(iObj, "part", iCaller):
+        getFunction(f)(iObj, iCaller)
+
+    # all reports, skip main scan loop
+    # Part, LinkGroup, Cut, Mirror on Body and Clone are called only from LinkGroup, Link or transformations
+    if iCaller != "main":
+        for f in getFurniturePartFunctions(iObj, "nested", iCaller):
+            getFunction(f)(iObj, iCaller)
+
+    # additional reports are set after the nested parts above
+    for f in getFurniturePartFunctions(iObj, "additional", iCaller):
+        setScanStep(f, [iObj, iCaller], iCaller)
 
     # skip not supported furniture parts with no error
     # Sheet, Transformations will be handling later
     return 0
 
 
+# ###################################################################################################################
+def selectFurniturePartQty(iObj, iQty, iCaller="selectFurniturePartQty"):
+    global gQty
+
+    # nothing to add
+    if iQty <= 0:
+        return 0
+
+    # evaluate the base part only once but count it iQty times,
+    # the multiplier stacks for nested arrays and patterns
+    vQty = gQty
+    gQty = gQty * iQty
+
+    try:
+        selectFurniturePart(iObj, iCaller)
+    finally:
+        gQty = vQty
+
+    return 0
+
+
+# ###################################################################################################################
+def scanContainer(iObj, iOBs, iCaller="scanContainer"):
+    global gApply
+    global gQty
+    global gRecords
+
+    # visibility of the container content depends on the main loop object
+    vVisibility = ""
+    if sTVF == "parent" or sTVF == "inherit":
+        vVisibility = gCallerObj.Visibility
+
+    vKey = getObjectKey(iObj) + (vVisibility,)
+
+    # already recorded, add the container content with current quantity
+    if vKey in dbSM:
+        for r in dbSM[vKey]:
+            setRecord(r[0], r[1] + [r[2] * gQty], iCaller)
+
+        return 0
+
+    # record the container content only once, for single quantity
+    vRecord = []
+    vState = [gApply, gQty, gRecords]
+
+    gApply = False
+    gQty = 1
+    gRecords = [vRecord]
+
+    try:
+        scanObjects(iOBs, iCaller)
+    finally:
+        [gApply, gQty, gRecords] = vState
+
+    # store and add the content after the container scan
+    setScanStep("setContainer", [iObj, vKey, vRecord], iCaller)
+
+    return 0
+
+
+# ###################################################################################################################
+def setContainer(iObj, iKey, iRecord, iCaller="setContainer"):
+    # the same parts are stored as single record with quantity
+    vParts = dict()
+    for i, r in enumerate(iRecord):
+        vPart = str([r[0], r[1][:-1]])
+
+        # additional report entry with custom key adds names and values each time, so it is not merged
+        if r[0] == "addDBAdditional" and r[1][3] == True:
+            vPart = i
+
+        if vPart in vParts:
+            vParts[vPart][2] = vParts[vPart][2] + r[1][-1]
+        else:
+            vParts[vPart] = [r[0], list(r[1][:-1]), r[1][-1]]
+
+    dbSM[iKey] = list(vParts.values())
+
+    # add the container content with current quantity
+    scanContainer(iObj, [], iCaller)
+
+    return 0
+
+
 # ###################################################################################################################
 # Support for transformations of base furniture parts
 # ###################################################################################################################
@@ -2047,8 +2578,8 @@ def setAppPart(iObj, iCaller="setAppPart"):
             # set reference point to the objects list
             key = iObj.Group
 
-            # call scan for each object at the list
-            scanObjects(key, iCaller)
+            # call scan for each object at the list, only once for each container
+            scanContainer(iObj, key, iCaller)
 
         except:
             # if there is wrong structure
@@ -2066,8 +2597,8 @@ def setAppLinkGroup(iObj, iCaller="setAppLinkGroup"):
             # set reference point to the objects list
             key = iObj.ElementList
 
-            # call scan for each object at the list
-            scanObjects(key, iCaller)
+            # call scan for each object at the list, only once for each container
+            scanContainer(iObj, key, iCaller)
 
         except:
             # if there is wrong structure
@@ -2155,6 +2686,8 @@ def setPartMirroring(iObj, iCaller="setPartMirroring"):
 
 # ###################################################################################################################
 def setDraftArray(iObj, iCaller="setDraftArray"):
+    global gQty
+
     # support for Array FreeCAD feature
     if iObj.isDerivedFrom("Part::FeaturePython") and iObj.Name.startswith("Array"):
         try:
@@ -2174,25 +2707,23 @@ def setDraftArray(iObj, iCaller="setDraftArray"):
 
             # if array on array add base too
             if key.isDerivedFrom("Part::FeaturePython") and key.Name.startswith("Array"):
-                k = 0
-                while k < vArray:
-                    setDraftArray(key, "self")
-                    k = k + 1
+                if vArray > 0:
+                    vQty = gQty
+                    gQty = gQty * vArray
+
+                    try:
+                        setDraftArray(key, "self")
+                    finally:
+                        gQty = vQty
 
             # array on Compound
             elif key.isDerivedFrom("Part::Compound"):
                 for c in key.Links:
-                    k = 0
-                    while k < vArray:
-                        selectFurniturePart(c, iCaller)
-                        k = k + 1
+                    selectFurniturePartQty(c, vArray, iCaller)
 
             # single array
             else:
-                k = 0
-                while k < vArray:
-                    selectFurniturePart(key, iCaller)
-                    k = k + 1
+                selectFurniturePartQty(key, vArray, iCaller)
 
         except:
             # if there is wrong structure
@@ -2267,16 +2798,12 @@ def setPartDesignLinearPattern(iObj, iCaller="setPartDesignLinearPattern"):
             # set number of occurrences
             oc = iObj.Occurrences
 
-            k = 0
             if oc > 0:
-                # loop for each occurrence without base element
-                while k < oc - 1:
-                    # set reference object (only one is supported for now)
-                    key = iObj.Originals[0]
+                # set reference object (only one is supported for now)
+                key = iObj.Originals[0]
 
-                    # select furniture part
-                    selectFurniturePart(key, iCaller)
-                    k = k + 1
+                # select furniture part for each occurrence without base element
+                selectFurniturePartQty(key, oc - 1, iCaller)
         except:
             # if there is wrong structure
             showError(iCaller, iObj, "setPartDesignLinearPattern", "wrong structure")
@@ -2319,14 +2846,9 @@ def setPartDesignMultiTransform(iObj, iCaller="setPartDesignMultiTransform"):
             # calculate number of base elements
             lenT = (linear * mirror) - 1
 
-            # for number off transformations
-            k = 0
-            while k < lenT:
-                # select furniture part for all objects
-                for key in iObj.Originals:
-                    selectFurniturePart(key, iCaller)
-
-                k = k + 1
+            # select furniture part for all objects, for number off transformations
+            for key in iObj.Originals:
+                selectFurniturePartQty(key, lenT, iCaller)
 
         except:
             # if there is wrong structure
@@ -2366,8 +2888,83 @@ def getCutContentPath(iObj, iType, iCaller="getCutContentPath"):
     return visibility
 
 
+# ###################################################################################################################
+def isVisibilityContainer(iObj, iCaller="isVisibilityContainer"):
+    # containers which pass visibility to the content
+    if (
+        iObj.isDerivedFrom("App::LinkGroup")
+        or iObj.isDerivedFrom("Part::Compound")
+        or iObj.isDerivedFrom("Part::Cut")
+        or iObj.isDerivedFrom("App::Part")
+        or iObj.isDerivedFrom("PartDesign::Body")
+    ):
+        return True
+
+    return False
+
+
+# ###################################################################################################################
+def setVisibility(iOBs, iCaller="setVisibility"):
+    # compute visibility for all objects only once, top-down from the root objects,
+    # so the scan loop does not walk InList for each object
+
+    dbVP.clear()
+    dbVI.clear()
+
+    if sTVF != "parent" and sTVF != "inherit":
+        return 0
+
+    try:
+        # nearest parent visibility
+        if sTVF == "parent":
+            for o in iOBs:
+                vInList = o.InList
+
+                if len(vInList) > 0:
+                    dbVP[getObjectKey(o)] = vInList[0].Visibility
+
+            return 0
+
+        # hidden container above wins, no matter which path reaches the object first,
+        # so the object is visited again only if it turns out to be hidden
+        vQueue = [(o, True) for o in iOBs if len(o.InList) == 0]
+
+        i = 0
+        while i < len(vQueue):
+            o, v = vQueue[i]
+            i = i + 1
+
+            vKey = getObjectKey(o)
+            if vKey in dbVI:
+                if dbVI[vKey] == False or v == True:
+                    continue
+
+            dbVI[vKey] = v
+
+            # the content of hidden container is hidden
+            if v == True and isVisibilityContainer(o):
+                v = o.Visibility
+
+            for c in o.OutList:
+                vQueue.append((c, v))
+
+    except:
+        # the scan falls back to the object parents
+        dbVP.clear()
+        dbVI.clear()
+        showError(iCaller, gAD, "setVisibility", "visibility map error")
+        return -1
+
+    return 0
+
+
 # ###################################################################################################################
 def getParentVisibility(iObj, iCaller="getParentVisibility"):
+    vKey = getObjectKey(iObj)
+
+    if vKey in dbVP:
+        return dbVP[vKey]
+
     # set starting point if there is no parent
     if gCallerObj.Visibility == True:
         v = True
@@ -2398,15 +2995,14 @@ def getInheritedVisibility(iObj, iCaller="getInheritedVisibility"):
         if gCallerObj.Visibility == True:
             return True
 
+        vKey = getObjectKey(iObj)
+
+        if vKey in dbVI:
+            return dbVI[vKey]
+
         # inherit visibility from the highest container only if the object is hidden
         for o in iObj.InListRecursive:
-            if (
-                o.isDerivedFrom("App::LinkGroup")
-                or o.isDerivedFrom("Part::Compound")
-                or o.isDerivedFrom("Part::Cut")
-                or o.isDerivedFrom("App::Part")
-                or o.isDerivedFrom("PartDesign::Body")
-            ):
+            if isVisibilityContainer(o):
                 if o.Visibility == False:
                     v = False
                 else:
@@ -2419,79 +3015,657 @@ def getInheritedVisibility(iObj, iCaller="getInheritedVisibility"):
 
 
 # ###################################################################################################################
-def scanObjects(iOBs, iCaller="main"):
-    global gCallerObj
+def setScanStep(iFunction, iArgs, iCaller="setScanStep"):
+    # add scan step to run after the current step, with current quantity and records
+    gScanPending.append([iFunction, iArgs, gQty, gApply, gRecords])
 
-    # search all objects in document and set database for correct ones
-    for obj in iOBs:
-        # set currently parsed object called from main loop
-        if iCaller == "main":
-            gCallerObj = obj
-
-        # ##################################################################
-        # debug section
-        # ##################################################################
-
-        if gDebugLoop == True:
-            FreeCAD.Console.PrintMessage("\n\n")
-            FreeCAD.Console.PrintMessage("scanObjects")
-            FreeCAD.Console.PrintMessage("\n")
-            FreeCAD.Console.PrintMessage("Caller function: " + str(iCaller))
-            FreeCAD.Console.PrintMessage("\n")
-            FreeCAD.Console.PrintMessage("Caller object: " + str(gCallerObj.Label))
-            FreeCAD.Console.PrintMessage("\n")
-            FreeCAD.Console.PrintMessage("Parsed object: " + str(obj.Label))
-
-        # ##################################################################
-        # check if parsing is allowed
-        # ##################################################################
-
-        # check copy listing special property
-        if hasattr(obj, "BOM"):
-            if obj.BOM == False:
+    return 0
+
+
+# ###################################################################################################################
+def runScan(iSteps, iCaller="runScan"):
+    # explicit stack of scan steps instead of recursion, steps added by the step
+    # are run before the next steps, so the parts are added in the tree order
+    global gApply
+    global gQty
+    global gRecords
+    global gScanPending
+
+    vState = [gApply, gQty, gRecords]
+
+    # step, instance path of the step (parent steps), index at parent step, parent step
+    vStack = [[s, (), i, ["runScan", s[1][0]]] for i, s in reversed(list(enumerate(iSteps)))]
+    vVisited = set()
+
+    try:
+        while len(vStack) > 0:
+            [vStep, vPath, vIndex, vParent] = vStack.pop()
+            [vFunction, vArgs, gQty, gApply, gRecords] = vStep
+
+            try:
+                vKey = (vFunction,) + getObjectKey(vArgs[0])
+
+            except:
+                # if there is wrong structure
+                showError(iCaller, vParent[1], vParent[0], "wrong structure")
                 continue
 
-        # simple object visibility
-        if sTVF == "on":
-            if obj.Visibility == False:
+            # each object at the instance path is evaluated only once
+            if (vKey, vPath, vIndex) in vVisited:
                 continue
 
-        # inherit visibility from nearest parent
-        if sTVF == "parent":
-            if getParentVisibility(obj, iCaller) == False:
+            vVisited.add((vKey, vPath, vIndex))
+
+            # step is scan of the parent step again
+            if vKey in vPath:
+                showError(iCaller, vArgs[0], getFunctionName(vFunction), "cyclic structure")
                 continue
 
-        # inherit visibility from highest container
-        # linking from middle visible container in highest hidden container
-        if sTVF == "inherit":
-            if getInheritedVisibility(obj, iCaller) == False:
+            # step is too deep
+            if len(vPath) >= gScanDepth:
+                showError(iCaller, vArgs[0], getFunctionName(vFunction), "structure too deep")
                 continue
 
-        # show only Base objects from Part :: Cut
-        if sPartCut == "base":
-            if getCutContentPath(obj, "Base", iCaller) == False:
+            gScanPending = []
+
+            try:
+                getFunction(vFunction)(*vArgs)
+
+            except:
+                # if there is wrong structure
+                showError(iCaller, vParent[1], vParent[0], "wrong structure")
+
+            # steps added by this step are run before the next steps
+            vChild = vPath + (vKey,)
+            for i in range(len(gScanPending) - 1, -1, -1):
+                vStack.append([gScanPending[i], vChild, i, [getFunctionName(vFunction), vArgs[0]]])
+
+            gScanPending = None
+
+    finally:
+        gScanPending = None
+        [gApply, gQty, gRecords] = vState
+
+    return 0
+
+
+# ###################################################################################################################
+def scanObjects(iOBs, iCaller="main"):
+    # search all objects in document and set database for correct ones
+    vSteps = [["scanObject", [obj, iCaller], gQty, gApply, gRecords] for obj in iOBs]
+
+    # nested scan, objects are scanned after the current scan step
+    if gScanPending != None:
+        gScanPending.extend(vSteps)
+        return 0
+
+    return runScan(vSteps, iCaller)
+
+
+# ###################################################################################################################
+def scanObject(iObj, iCaller="main"):
+    global gCallerObj
+
+    # set currently parsed object called from main loop
+    if iCaller == "main":
+        gCallerObj = iObj
+
+    # ##################################################################
+    # check if parsing is allowed
+    # ##################################################################
+
+    # check copy listing special property
+    if hasattr(iObj, "BOM"):
+        if iObj.BOM == False:
+            return 0
+
+    # simple object visibility
+    if sTVF == "on":
+        if iObj.Visibility == False:
+            return 0
+
+    # inherit visibility from nearest parent
+    if sTVF == "parent":
+        if getParentVisibility(iObj, iCaller) == False:
+            return 0
+
+    # inherit visibility from highest container
+    # linking from middle visible container in highest hidden container
+    if sTVF == "inherit":
+        if getInheritedVisibility(iObj, iCaller) == False:
+            return 0
+
+    # show only Base objects from Part :: Cut
+    if sPartCut == "base":
+        if getCutContentPath(iObj, "Base", iCaller) == False:
+            return 0
+
+    # show only Tool objects from Part :: Cut
+    if sPartCut == "tool":
+        if getCutContentPath(iObj, "Tool", iCaller) == False:
+            return 0
+
+    # ##################################################################
+    # run functions and time travel machine ;-)
+    # ##################################################################
+
+    # select and set furniture part
+    selectFurniturePart(iObj, iCaller)
+
+    # set transformations, each after the parts added by the previous one
+    for f in getFurniturePartFunctions(iObj, "transformation", iCaller):
+        setScanStep(f, [iObj], iCaller)
+
+    return 0
+
+
+# ###################################################################################################################
+def getViews(iCaller="getViews"):
+    # report types for single scan, sLTF first and each type only once
+    vViews = ""
+
+    for v in str(sLTF) + str(sViews):
+        if v in sLTFDsc and v not in vViews:
+            vViews += v
+
+    return vViews
+
+
+# ###################################################################################################################
+def isView(iViews, iCaller="isView"):
+    # at least one of the report types is scanned
+    for v in iViews:
+        if v in gViews:
+            return True
+
+    return False
+
+
+# ###################################################################################################################
+def getSettings(iCaller="getSettings"):
+    # all settings which change the part records
+    vSettings = (
+        sLang,
+        sTVF,
+        sPartCut,
+        sUnitsMetric,
+        getViews(iCaller),
+        sUnitsArea,
+        sUnitsEdge,
+        sEColor,
+        sARME,
+        sARM,
+        sARP,
+        sARD,
+        sARGD,
+        len(dbFP),  # registered furniture parts
+    )
+
+    return vSettings
+
+
+# ###################################################################################################################
+def scanDocument(iOBs, iCaller="scanDocument"):
+    global gApply
+    global gViews
+
+    # all report types from single scan, databases are set later for each report type
+    gViews = getViews(iCaller)
+
+    if len(gViews) > 1:
+        gApply = False
+
+    # visibility and groups for all objects
+    setVisibility(iOBs, iCaller)
+    setGroups(gAD.Objects, iCaller)
+    dbSM.clear()
+
+    # get still valid part records from the previous report
+    vSettings = getSettings(iCaller)
+    if getDimensionsCache != None:
+        vRecords = getDimensionsCache.getRecords(gAD, vSettings)
+    else:
+        vRecords = dict()
+
+    vNew = dict()
+    vCache = dict()
+
+    for obj in iOBs:
+        if gProfile == 1:
+            vStart = time.perf_counter()
+
+        # not changed object, add records without the object scan
+        if obj.Name in vRecords:
+            vRecord = vRecords[obj.Name]
+            setRecords(vRecord, iCaller)
+            vCache[obj.Name] = vRecord
+
+        # new or changed object, scan and record
+        else:
+            vRecord = []
+            gRecords.append(vRecord)
+            vErrors = len(gErrors)
+
+            try:
+                scanObjects([obj], "main")
+            finally:
+                gRecords.pop()
+
+            # objects with errors are scanned again, so the errors are not lost for the next report
+            if len(gErrors) == vErrors:
+                vCache[obj.Name] = vRecord
+
+        vNew[obj.Name] = vRecord
+
+        if gProfile == 1:
+            addProfileObject(obj, time.perf_counter() - vStart, iCaller)
+
+    # keep records for the next report
+    if getDimensionsCache != None:
+        getDimensionsCache.setRecords(gAD, vSettings, vCache)
+
+    # keep records for report types
+    dbSR.clear()
+    dbSR.update(vNew)
+
+    gApply = True
+
+    # set databases for the main report type
+    if len(gViews) > 1:
+        setViewRecords(gViews[0], iCaller)
+
+
+# ###################################################################################################################
+def setViewRecords(iView, iCaller="setViewRecords"):
+    # set databases for single report type from the last scan records
+    global sLTF
+
+    for c in dbCL.values():
+        del c[:]
+
+    del dbCNO[:]
+
+    for db in [dbCNQ, dbCNN, dbCNV, dbCNL, dbCNH, dbCNOH, dbARQ, dbARN, dbARV]:
+        db.clear()
+
+    sLTF = iView
+
+    for vRecord in dbSR.values():
+        for r in vRecord:
+            if iView in dbRV[r[0]]:
+                globals()[r[0]](*r[1])
+
+    return 0
+
+
+# ###################################################################################################################
+# Spreadsheet writer - buffer for report views, flushed to spreadsheet in one pass
+# ###################################################################################################################
+
+
+# ###################################################################################################################
+def getColumnIndex(iColumn, iCaller="getColumnIndex"):
+    # column letters to index, A = 1, Z = 26, AA = 27
+    vIndex = 0
+
+    for c in iColumn:
+        vIndex = (vIndex * 26) + (ord(c) - 64)
+
+    return vIndex
+
+
+# ###################################################################################################################
+def getColumnName(iIndex, iCaller="getColumnName"):
+    # column index to letters, 1 = A, 26 = Z, 27 = AA
+    vName = ""
+
+    while iIndex > 0:
+        iIndex, r = divmod(iIndex - 1, 26)
+        vName = chr(65 + r) + vName
+
+    return vName
+
+
+# ###################################################################################################################
+def getCells(iRange, iCaller="getCells"):
+    # list of (column, row) for cell "A1" or range "A1:G1"
+    vCells = []
+
+    vAddress = iRange.split(":")
+    if len(vAddress) == 1:
+        vAddress.append(vAddress[0])
+
+    vPos = []
+    for a in vAddress:
+        vLetters = a.rstrip("0123456789")
+        vPos.append([getColumnIndex(vLetters), int(a[len(vLetters) :])])
+
+    [c1, r1], [c2, r2] = vPos
+
+    for r in range(min(r1, r2), max(r1, r2) + 1):
+        for c in range(min(c1, c2), max(c1, c2) + 1):
+            vCells.append((c, r))
+
+    return vCells
+
+
+# ###################################################################################################################
+def getRanges(iCells, iCaller="getRanges"):
+    # collapse cells into rectangle ranges, first into row runs and then the same runs at next rows
+    vRuns = []
+
+    for c, r in sorted(iCells, key=lambda x: (x[1], x[0])):
+        if len(vRuns) > 0 and vRuns[-1][0] == r and vRuns[-1][2] == c - 1:
+            vRuns[-1][2] = c
+        else:
+            vRuns.append([r, c, c])
+
+    vOpen = dict()  # (first column, last column) = [first row, last row]
+    vRects = []
+
+    for r, c1, c2 in vRuns:
+        k = (c1, c2)
+
+        if k in vOpen and vOpen[k][1] == r - 1:
+            vOpen[k][1] = r
+            continue
+
+        if k in vOpen:
+            vRects.append([c1, vOpen[k][0], c2, vOpen[k][1]])
+
+        vOpen[k] = [r, r]
+
+    for k, v in vOpen.items():
+        vRects.append([k[0], v[0], k[1], v[1]])
+
+    vRanges = []
+    for c1, r1, c2, r2 in vRects:
+        vRange = getColumnName(c1) + str(r1)
+
+        if c1 != c2 or r1 != r2:
+            vRange += ":" + getColumnName(c2) + str(r2)
+
+        vRanges.append(vRange)
+
+    return vRanges
+
+
+# ###################################################################################################################
+class SheetWriter:
+    # the same calls as Spreadsheet::Sheet object but only the final cell state is stored,
+    # so the header styles set many times for the same cell are written to the spreadsheet only once
+
+    def __init__(self, iSheet):
+        self.sheet = iSheet
+        self.content = dict()  # (column, row) = content
+        self.style = dict()  # (column, row) = set of styles
+        self.alignment = dict()  # (column, row) = (alignment, mode)
+        self.background = dict()  # (column, row) = color
+        self.foreground = dict()  # (column, row) = color
+        self.merged = []  # ranges to merge in order of calls
+        self.width = dict()  # column = width
+
+    def set(self, iRange, iContent):
+        for cell in getCells(iRange):
+            self.content[cell] = iContent
+
+    def setStyle(self, iRange, iStyle, iMode="replace"):
+        vStyle = set(iStyle.split("|"))
+
+        for cell in getCells(iRange):
+            if iMode == "add":
+                self.style[cell] = self.style.get(cell, set()) | vStyle
+            elif iMode == "remove":
+                self.style[cell] = self.style.get(cell, set()) - vStyle
+            else:
+                self.style[cell] = vStyle
+
+    def setAlignment(self, iRange, iAlignment, iMode="replace"):
+        for cell in getCells(iRange):
+            self.alignment[cell] = (iAlignment, iMode)
+
+    def setBackground(self, iRange, iColor):
+        for cell in getCells(iRange):
+            self.background[cell] = tuple(iColor)
+
+    def setForeground(self, iRange, iColor):
+        for cell in getCells(iRange):
+            self.foreground[cell] = tuple(iColor)
+
+    def mergeCells(self, iRange):
+        if iRange not in self.merged:
+            self.merged.append(iRange)
+
+    def setColumnWidth(self, iColumn, iWidth):
+        self.width[iColumn] = iWidth
+
+    def getGroups(self, iDB):
+        # cells grouped by value, in order of the first cell
+        vGroups = dict()
+
+        for cell, value in iDB.items():
+            if value not in vGroups:
+                vGroups[value] = []
+
+            vGroups[value].append(cell)
+
+        return vGroups
+
+    def flush(self):
+        for value, cells in self.getGroups(self.content).items():
+            for r in getRanges(cells):
+                self.sheet.set(r, value)
+
+        for value, cells in self.getGroups({k: "|".join(sorted(v)) for k, v in self.style.items()}).items():
+            if value != "":
+                for r in getRanges(cells):
+                    self.sheet.setStyle(r, value, "add")
+
+        for value, cells in self.getGroups(self.alignment).items():
+            for r in getRanges(cells):
+                self.sheet.setAlignment(r, value[0], value[1])
+
+        for value, cells in self.getGroups(self.background).items():
+            for r in getRanges(cells):
+                self.sheet.setBackground(r, value)
+
+        for value, cells in self.getGroups(self.foreground).items():
+            for r in getRanges(cells):
+                self.sheet.setForeground(r, value)
+
+        for r in self.merged:
+            self.sheet.mergeCells(r)
+
+        for column, width in self.width.items():
+            self.sheet.setColumnWidth(column, width)
+
+
+# ###################################################################################################################
+# Report files - write report view from buffer, without spreadsheet
+# ###################################################################################################################
+
+
+# ###################################################################################################################
+def getReportCell(iContent, iCaller="getReportCell"):
+    # remove FreeCAD expression used to keep units, "=<<18 mm>>" is "18 mm"
+    vContent = str(iContent)
+
+    if vContent.startswith("=<<") and vContent.endswith(">>"):
+        vContent = vContent[3:-2]
+
+    return vContent
+
+
+# ###################################################################################################################
+def getReportTable(iWriter, iCaller="getReportTable"):
+    # report table as rows of cells, cell is dict with content and decoration,
+    # cells hidden by merged cells are None
+    vCells = list(iWriter.content.keys()) + list(iWriter.background.keys())
+
+    if len(vCells) == 0:
+        return []
+
+    vMaxC = max([c for c, r in vCells])
+    vMaxR = max([r for c, r in vCells])
+
+    # merged cells spans
+    vSpans = dict()
+    vHidden = set()
+
+    for m in iWriter.merged:
+        vMerged = getCells(m)
+        vSpans[vMerged[0]] = (
+            vMerged[-1][0] - vMerged[0][0] + 1,
+            vMerged[-1][1] - vMerged[0][1] + 1,
+        )
+        vHidden.update(vMerged[1:])
+
+    vTable = []
+
+    for r in range(1, vMaxR + 1):
+        vRow = []
+
+        for c in range(1, vMaxC + 1):
+            k = (c, r)
+
+            if k in vHidden:
+                vRow.append(None)
                 continue
 
-        # show only Tool objects from Part :: Cut
-        if sPartCut == "tool":
-            if getCutContentPath(obj, "Tool", iCaller) == False:
+            vCell = dict()
+            vCell["content"] = getReportCell(iWriter.content.get(k, ""))
+            vCell["span"] = vSpans.get(k, (1, 1))
+            vCell["alignment"] = iWriter.alignment.get(k, ("", ""))[0]
+            vCell["style"] = "|".join(sorted(iWriter.style.get(k, set())))
+            vCell["background"] = iWriter.background.get(k, None)
+            vRow.append(vCell)
+
+        vTable.append(vRow)
+
+    return vTable
+
+
+# ###################################################################################################################
+def getReportColor(iColor, iCaller="getReportColor"):
+    # spreadsheet color to HTML color
+    return "#" + "".join(["%02x" % int(round(float(v) * 255)) for v in iColor[:3]])
+
+
+# ###################################################################################################################
+def setReportCSV(iTable, iFile, iCaller="setReportCSV"):
+    vWriter = csv.writer(iFile)
+
+    for vRow in iTable:
+        vWriter.writerow([c["content"] if c != None else "" for c in vRow])
+
+
+# ###################################################################################################################
+def setReportJSON(iTable, iFile, iCaller="setReportJSON"):
+    vRows = []
+
+    for vRow in iTable:
+        vItem = dict()
+
+        for i, c in enumerate(vRow):
+            vItem[getColumnName(i + 1)] = c["content"] if c != None else ""
+
+        vRows.append(vItem)
+
+    json.dump(vRows, iFile, indent=1)
+
+
+# ###################################################################################################################
+def setReportMD(iTable, iFile, iCaller="setReportMD"):
+    vAlign = {"left": ":--", "right": "--:", "center": ":-:"}
+
+    for r, vRow in enumerate(iTable):
+        vCells = []
+
+        for c in vRow:
+            vContent = c["content"] if c != None else ""
+            vCells.append(vContent.replace("|", "\\|"))
+
+        iFile.write("|   " + "   |   ".join(vCells) + "   |\n")
+
+        # alignment from the second row, the first row can be header with merged cells
+        if r == 0:
+            vDash = []
+
+            for i in range(len(vRow)):
+                a = ""
+
+                if len(iTable) > 1 and iTable[1][i] != None:
+                    a = iTable[1][i]["alignment"]
+
+                vDash.append(vAlign.get(a, "---"))
+
+            iFile.write("|" + "|".join(vDash) + "|\n")
+
+
+# ###################################################################################################################
+def setReportHTML(iTable, iFile, iCaller="setReportHTML"):
+    iFile.write("<TABLE>\n")
+
+    for vRow in iTable:
+        iFile.write(" <TR>\n")
+
+        for c in vRow:
+            # hidden by merged cell
+            if c == None:
                 continue
 
-        # ##################################################################
-        # run functions and time travel machine ;-)
-        # ##################################################################
+            vTD = "  <TD "
+
+            if c["span"][0] > 1:
+                vTD += 'colspan="' + str(c["span"][0]) + '" '
+
+            if c["span"][1] > 1:
+                vTD += 'rowspan="' + str(c["span"][1]) + '" '
+
+            vTD += 'style="'
+
+            if c["alignment"] != "":
+                vTD += "text-align:" + c["alignment"] + ";"
+
+            if c["background"] != None:
+                vTD += "background-color:" + getReportColor(c["background"]) + ";"
+
+            if c["style"].find("bold") != -1:
+                vTD += "font-weight:bold;"
+
+            vTD += '">'
+            vTD += html.escape(c["content"])
+            vTD += "</TD>\n"
+
+            iFile.write(vTD)
+
+        iFile.write(" </TR>\n")
+
+    iFile.write("</TABLE>\n")
 
-        # select and set furniture part
-        selectFurniturePart(obj, iCaller)
 
-        # set transformations
-        setPartMirroring(obj)
-        setDraftArray(obj)
-        setDraftClone(obj)
-        setPartDesignMirrored(obj)
-        setPartDesignMultiTransform(obj)
-        setPartDesignLinearPattern(obj)
-        setAppLink(obj)
+# ###################################################################################################################
+def setReportFile(iWriter, iPath, iCaller="setReportFile"):
+    # file type from file extension
+    vType = os.path.splitext(iPath)[1].lower()[1:]
+
+    vSinks = {
+        "csv": setReportCSV,
+        "json": setReportJSON,
+        "md": setReportMD,
+        "html": setReportHTML,
+    }
+
+    if vType not in vSinks:
+        showError(iCaller, gAD, "setReportFile", "not supported file type " + str(vType))
+        return -1
+
+    vTable = getReportTable(iWriter, iCaller)
+
+    with open(os.path.expanduser(iPath), "w", encoding="utf-8", newline="") as f:
+        vSinks[vType](vTable, f, iCaller)
+
+    return 0
 
 
 # ###################################################################################################################
@@ -2627,15 +3801,13 @@ def setViewQ(iCaller="setViewQ"):
     gSheetRow = gSheetRow + 1
 
     # add values
-    for key in dbDA.keys():
-        a = key.split(":")
-
-        gSheet.set("A" + str(gSheetRow), toSheet(dbDQ[key], "string", iCaller) + " x")
-        gSheet.set("C" + str(gSheetRow), toSheet(a[1], "d", iCaller))
+    for g in getDBGroups(getDBColumns(iCaller), iCaller):
+        gSheet.set("A" + str(gSheetRow), toSheet(g["qty"], "string", iCaller) + " x")
+        gSheet.set("C" + str(gSheetRow), toSheet(g["width"], "d", iCaller))
         gSheet.set("D" + str(gSheetRow), "x")
-        gSheet.set("E" + str(gSheetRow), toSheet(a[2], "d", iCaller))
-        gSheet.set("F" + str(gSheetRow), toSheet(a[0], "d", iCaller))
-        gSheet.set("G" + str(gSheetRow), toSheet(dbDA[key], "area", iCaller))
+        gSheet.set("E" + str(gSheetRow), toSheet(g["length"], "d", iCaller))
+        gSheet.set("F" + str(gSheetRow), toSheet(g["thick"], "d", iCaller))
+        gSheet.set("G" + str(gSheetRow), toSheet(g["area"], "area", iCaller))
 
         # merge cells
         vCell = "A" + str(gSheetRow) + ":B" + str(gSheetRow)
@@ -2685,10 +3857,10 @@ def setViewQ(iCaller="setViewQ"):
     # go to next spreadsheet row
     gSheetRow = gSheetRow + 1
 
-    for key in dbTQ.keys():
-        gSheet.set("A" + str(gSheetRow), toSheet(dbTQ[key], "string", iCaller) + " x")
-        gSheet.set("F" + str(gSheetRow), toSheet(key, "d", iCaller))
-        gSheet.set("G" + str(gSheetRow), toSheet(dbTA[key], "area", iCaller))
+    for g in getDBGroups(["thick"], iCaller):
+        gSheet.set("A" + str(gSheetRow), toSheet(g["qty"], "string", iCaller) + " x")
+        gSheet.set("F" + str(gSheetRow), toSheet(g["thick"], "d", iCaller))
+        gSheet.set("G" + str(gSheetRow), toSheet(g["area"], "area", iCaller))
         gSheet.setAlignment("A" + str(gSheetRow), "right", "keep")
         gSheet.setAlignment("B" + str(gSheetRow), "right", "keep")
         gSheet.setAlignment("F" + str(gSheetRow), "right", "keep")
@@ -2731,29 +3903,26 @@ def setViewA(iCaller="setViewA"):
     gSheetRow = gSheetRow + 1
 
     # add values
-    for key in dbDQ.keys():
-        # split key
-        a = key.split(":")
-
+    for g in getDBGroups(getDBColumns(iCaller), iCaller):
         # split group
-        group = a[3]
-        label = a[3]
+        group = g["group"]
+        label = g["group"]
         grain = ""
 
         if group.find(", ") != -1:
             more = group.split(", ")
             label = more[0]
-            g = more[1]
+            vGrain = more[1]
 
-            if g == "grain horizontal":
+            if vGrain == "grain horizontal":
                 grain = "h"
-            if g == "grain vertical":
+            if vGrain == "grain vertical":
                 grain = "v"
 
-        gSheet.set("A" + str(gSheetRow), toSheet(a[1], "string", iCaller))  # Length
-        gSheet.set("B" + str(gSheetRow), toSheet(a[2], "string", iCaller))  # Width
-        gSheet.set("C" + str(gSheetRow), toSheet(dbDQ[key], "string", iCaller))  # Qty
-        gSheet.set("D" + str(gSheetRow), toSheet(a[0], "string", iCaller))  # Material
+        gSheet.set("A" + str(gSheetRow), toSheet(g["width"], "string", iCaller))  # Length
+        gSheet.set("B" + str(gSheetRow), toSheet(g["length"], "string", iCaller))  # Width
+        gSheet.set("C" + str(gSheetRow), toSheet(g["qty"], "string", iCaller))  # Qty
+        gSheet.set("D" + str(gSheetRow), toSheet(g["thick"], "string", iCaller))  # Material
         gSheet.set("E" + str(gSheetRow), toSheet(label, "string", iCaller))  # Label
         gSheet.set("F" + str(gSheetRow), "true")  # Enabled
         gSheet.set("G" + str(gSheetRow), toSheet(grain, "string", iCaller))  # Grain direction
@@ -2818,16 +3987,14 @@ def setViewN(iCaller="setViewN"):
     gSheetRow = gSheetRow + 1
 
     # add values
-    for key in dbDA.keys():
-        a = key.split(":")
-
-        gSheet.set("A" + str(gSheetRow), toSheet(a[3], "string", iCaller))
-        gSheet.set("B" + str(gSheetRow), toSheet(a[1], "d", iCaller))
+    for g in getDBGroups(getDBColumns(iCaller), iCaller):
+        gSheet.set("A" + str(gSheetRow), toSheet(g["label"], "string", iCaller))
+        gSheet.set("B" + str(gSheetRow), toSheet(g["width"], "d", iCaller))
         gSheet.set("C" + str(gSheetRow), "x")
-        gSheet.set("D" + str(gSheetRow), toSheet(a[2], "d", iCaller))
-        gSheet.set("E" + str(gSheetRow), toSheet(a[0], "d", iCaller))
-        gSheet.set("F" + str(gSheetRow), toSheet(dbDQ[key], "string", iCaller))
-        gSheet.set("G" + str(gSheetRow), toSheet(dbDA[key], "area", iCaller))
+        gSheet.set("D" + str(gSheetRow), toSheet(g["length"], "d", iCaller))
+        gSheet.set("E" + str(gSheetRow), toSheet(g["thick"], "d", iCaller))
+        gSheet.set("F" + str(gSheetRow), toSheet(g["qty"], "string", iCaller))
+        gSheet.set("G" + str(gSheetRow), toSheet(g["area"], "area", iCaller))
 
         # go to next spreadsheet row
         gSheetRow = gSheetRow + 1
@@ -2873,10 +4040,10 @@ def setViewN(iCaller="setViewN"):
     # go to next spreadsheet row
     gSheetRow = gSheetRow + 1
 
-    for key in dbTQ.keys():
-        gSheet.set("E" + str(gSheetRow), toSheet(key, "d", iCaller))
-        gSheet.set("F" + str(gSheetRow), toSheet(dbTQ[key], "string", iCaller))
-        gSheet.set("G" + str(gSheetRow), toSheet(dbTA[key], "area", iCaller))
+    for g in getDBGroups(["thick"], iCaller):
+        gSheet.set("E" + str(gSheetRow), toSheet(g["thick"], "d", iCaller))
+        gSheet.set("F" + str(gSheetRow), toSheet(g["qty"], "string", iCaller))
+        gSheet.set("G" + str(gSheetRow), toSheet(g["area"], "area", iCaller))
         gSheet.setAlignment("E" + str(gSheetRow), "right", "keep")
         gSheet.setAlignment("F" + str(gSheetRow), "right", "keep")
         gSheet.setAlignment("G" + str(gSheetRow), "right", "keep")
@@ -2911,16 +4078,14 @@ def setViewG(iCaller="setViewG"):
     gSheetRow = gSheetRow + 1
 
     # add values
-    for key in dbDA.keys():
-        a = key.split(":")
-
-        gSheet.set("A" + str(gSheetRow), toSheet(a[3], "string", iCaller))
-        gSheet.set("B" + str(gSheetRow), toSheet(a[0], "d", iCaller))
-        gSheet.set("C" + str(gSheetRow), toSheet(a[1], "d", iCaller))
+    for g in getDBGroups(getDBColumns(iCaller), iCaller):
+        gSheet.set("A" + str(gSheetRow), toSheet(g["group"], "string", iCaller))
+        gSheet.set("B" + str(gSheetRow), toSheet(g["thick"], "d", iCaller))
+        gSheet.set("C" + str(gSheetRow), toSheet(g["width"], "d", iCaller))
         gSheet.set("D" + str(gSheetRow), "x")
-        gSheet.set("E" + str(gSheetRow), toSheet(a[2], "d", iCaller))
-        gSheet.set("F" + str(gSheetRow), toSheet(dbDQ[key], "string", iCaller))
-        gSheet.set("G" + str(gSheetRow), toSheet(dbDA[key], "area", iCaller))
+        gSheet.set("E" + str(gSheetRow), toSheet(g["length"], "d", iCaller))
+        gSheet.set("F" + str(gSheetRow), toSheet(g["qty"], "string", iCaller))
+        gSheet.set("G" + str(gSheetRow), toSheet(g["area"], "area", iCaller))
 
         # go to next spreadsheet row
         gSheetRow = gSheetRow + 1
@@ -2966,10 +4131,10 @@ def setViewG(iCaller="setViewG"):
     # go to next spreadsheet row
     gSheetRow = gSheetRow + 1
 
-    for key in dbTQ.keys():
-        gSheet.set("B" + str(gSheetRow), toSheet(key, "d", iCaller))
-        gSheet.set("F" + str(gSheetRow), toSheet(dbTQ[key], "string", iCaller))
-        gSheet.set("G" + str(gSheetRow), toSheet(dbTA[key], "area", iCaller))
+    for g in getDBGroups(["thick"], iCaller):
+        gSheet.set("B" + str(gSheetRow), toSheet(g["thick"], "d", iCaller))
+        gSheet.set("F" + str(gSheetRow), toSheet(g["qty"], "string", iCaller))
+        gSheet.set("G" + str(gSheetRow), toSheet(g["area"], "area", iCaller))
         gSheet.setAlignment("B" + str(gSheetRow), "right", "keep")
         gSheet.setAlignment("F" + str(gSheetRow), "right", "keep")
         gSheet.setAlignment("G" + str(gSheetRow), "right", "keep")
@@ -2984,7 +4149,7 @@ def setViewE(iCaller="setViewE"):
     global gSheetRow
 
     # add values
-    for key in dbDA.keys():
+    for g in getDBGroups(getDBColumns(iCaller), iCaller):
         # set headers
         gSheet.set("A" + str(gSheetRow), gLang1)
         gSheet.set("B" + str(gSheetRow), gLang3)
@@ -3018,15 +4183,13 @@ def setViewE(iCaller="setViewE"):
         # go to next spreadsheet row
         gSheetRow = gSheetRow + 1
 
-        a = key.split(":")
-
-        gSheet.set("A" + str(gSheetRow), toSheet(a[3], "string", iCaller))
-        gSheet.set("B" + str(gSheetRow), toSheet(a[1], "d", iCaller))
+        gSheet.set("A" + str(gSheetRow), toSheet(g["label"], "string", iCaller))
+        gSheet.set("B" + str(gSheetRow), toSheet(g["width"], "d", iCaller))
         gSheet.set("C" + str(gSheetRow), "x")
-        gSheet.set("D" + str(gSheetRow), toSheet(a[2], "d", iCaller))
-        gSheet.set("E" + str(gSheetRow), toSheet(a[0], "d", iCaller))
-        gSheet.set("F" + str(gSheetRow), toSheet(dbDQ[key], "string", iCaller))
-        gSheet.set("G" + str(gSheetRow), toSheet(dbDA[key], "area", iCaller))
+        gSheet.set("D" + str(gSheetRow), toSheet(g["length"], "d", iCaller))
+        gSheet.set("E" + str(gSheetRow), toSheet(g["thick"], "d", iCaller))
+        gSheet.set("F" + str(gSheetRow), toSheet(g["qty"], "string", iCaller))
+        gSheet.set("G" + str(gSheetRow), toSheet(g["area"], "area", iCaller))
 
         # alignment
         gSheet.setAlignment("A" + str(gSheetRow), "left", "keep")
@@ -3034,13 +4197,9 @@ def setViewE(iCaller="setViewE"):
         gSheet.setAlignment(vCell, "right", "keep")
 
         # if there are faces with edgeband
-        faces = 0
-        try:
-            faces = str(dbEFD[key])
-        except:
-            faces = 0
+        if g["faces"] != "":
+            [faceN, faceD, faceV] = g["faces"]
 
-        if faces != 0:
             # go to next spreadsheet row
             gSheetRow = gSheetRow + 1
 
@@ -3073,12 +4232,12 @@ def setViewE(iCaller="setViewE"):
 
             try:
                 # try get values
-                gSheet.set("A" + str(gSheetRow), toSheet(dbEFN[key][4], "string", iCaller))
-                gSheet.set("B" + str(gSheetRow), toSheet(dbEFN[key][5], "string", iCaller))
-                gSheet.set("D" + str(gSheetRow), toSheet(dbEFN[key][0], "string", iCaller))
-                gSheet.set("E" + str(gSheetRow), toSheet(dbEFN[key][1], "string", iCaller))
-                gSheet.set("F" + str(gSheetRow), toSheet(dbEFN[key][2], "string", iCaller))
-                gSheet.set("G" + str(gSheetRow), toSheet(dbEFN[key][3], "string", iCaller))
+                gSheet.set("A" + str(gSheetRow), toSheet(faceN[4], "string", iCaller))
+                gSheet.set("B" + str(gSheetRow), toSheet(faceN[5], "string", iCaller))
+                gSheet.set("D" + str(gSheetRow), toSheet(faceN[0], "string", iCaller))
+                gSheet.set("E" + str(gSheetRow), toSheet(faceN[1], "string", iCaller))
+                gSheet.set("F" + str(gSheetRow), toSheet(faceN[2], "string", iCaller))
+                gSheet.set("G" + str(gSheetRow), toSheet(faceN[3], "string", iCaller))
 
             except:
                 skip = 1
@@ -3096,34 +4255,34 @@ def setViewE(iCaller="setViewE"):
 
             try:
                 # try get values
-                if dbEFD[key][4] > 0:
-                    gSheet.set("A" + str(gSheetRow), toSheet(dbEFD[key][4], "d", iCaller))
-                if dbEFD[key][4] == -1:
+                if faceD[4] > 0:
+                    gSheet.set("A" + str(gSheetRow), toSheet(faceD[4], "d", iCaller))
+                if faceD[4] == -1:
                     gSheet.set("A" + str(gSheetRow), gLang14)
 
-                if dbEFD[key][5] > 0:
-                    gSheet.set("B" + str(gSheetRow), toSheet(dbEFD[key][5], "d", iCaller))
-                if dbEFD[key][5] == -1:
+                if faceD[5] > 0:
+                    gSheet.set("B" + str(gSheetRow), toSheet(faceD[5], "d", iCaller))
+                if faceD[5] == -1:
                     gSheet.set("B" + str(gSheetRow), gLang14)
 
-                if dbEFD[key][0] > 0:
-                    gSheet.set("D" + str(gSheetRow), toSheet(dbEFD[key][0], "d", iCaller))
-                if dbEFD[key][0] == -1:
+                if faceD[0] > 0:
+                    gSheet.set("D" + str(gSheetRow), toSheet(faceD[0], "d", iCaller))
+                if faceD[0] == -1:
                     gSheet.set("D" + str(gSheetRow), gLang14)
 
-                if dbEFD[key][1] > 0:
-                    gSheet.set("E" + str(gSheetRow), toSheet(dbEFD[key][1], "d", iCaller))
-                if dbEFD[key][1] == -1:
+                if faceD[1] > 0:
+                    gSheet.set("E" + str(gSheetRow), toSheet(faceD[1], "d", iCaller))
+                if faceD[1] == -1:
                     gSheet.set("E" + str(gSheetRow), gLang14)
 
-                if dbEFD[key][2] > 0:
-                    gSheet.set("F" + str(gSheetRow), toSheet(dbEFD[key][2], "d", iCaller))
-                if dbEFD[key][2] == -1:
+                if faceD[2] > 0:
+                    gSheet.set("F" + str(gSheetRow), toSheet(faceD[2], "d", iCaller))
+                if faceD[2] == -1:
                     gSheet.set("F" + str(gSheetRow), gLang14)
 
-                if dbEFD[key][3] > 0:
-                    gSheet.set("G" + str(gSheetRow), toSheet(dbEFD[key][3], "d", iCaller))
-                if dbEFD[key][3] == -1:
+                if faceD[3] > 0:
+                    gSheet.set("G" + str(gSheetRow), toSheet(faceD[3], "d", iCaller))
+                if faceD[3] == -1:
                     gSheet.set("G" + str(gSheetRow), gLang14)
 
             except:
@@ -3142,12 +4301,12 @@ def setViewE(iCaller="setViewE"):
 
             try:
                 # try get values
-                gSheet.set("A" + str(gSheetRow), toSheet(dbEFV[key][4], "string", iCaller))
-                gSheet.set("B" + str(gSheetRow), toSheet(dbEFV[key][5], "string", iCaller))
-                gSheet.set("D" + str(gSheetRow), toSheet(dbEFV[key][0], "string", iCaller))
-                gSheet.set("E" + str(gSheetRow), toSheet(dbEFV[key][1], "string", iCaller))
-                gSheet.set("F" + str(gSheetRow), toSheet(dbEFV[key][2], "string", iCaller))
-                gSheet.set("G" + str(gSheetRow), toSheet(dbEFV[key][3], "string", iCaller))
+                gSheet.set("A" + str(gSheetRow), toSheet(faceV[4], "string", iCaller))
+                gSheet.set("B" + str(gSheetRow), toSheet(faceV[5], "string", iCaller))
+                gSheet.set("D" + str(gSheetRow), toSheet(faceV[0], "string", iCaller))
+                gSheet.set("E" + str(gSheetRow), toSheet(faceV[1], "string", iCaller))
+                gSheet.set("F" + str(gSheetRow), toSheet(faceV[2], "string", iCaller))
+                gSheet.set("G" + str(gSheetRow), toSheet(faceV[3], "string", iCaller))
 
             except:
                 skip = 1
@@ -3210,10 +4369,10 @@ def setViewE(iCaller="setViewE"):
     # go to next spreadsheet row
     gSheetRow = gSheetRow + 1
 
-    for key in dbTQ.keys():
-        gSheet.set("E" + str(gSheetRow), toSheet(key, "d", iCaller))
-        gSheet.set("F" + str(gSheetRow), toSheet(dbTQ[key], "string", iCaller))
-        gSheet.set("G" + str(gSheetRow), toSheet(dbTA[key], "area", iCaller))
+    for g in getDBGroups(["thick"], iCaller):
+        gSheet.set("E" + str(gSheetRow), toSheet(g["thick"], "d", iCaller))
+        gSheet.set("F" + str(gSheetRow), toSheet(g["qty"], "string", iCaller))
+        gSheet.set("G" + str(gSheetRow), toSheet(g["area"], "area", iCaller))
         gSheet.setAlignment("E" + str(gSheetRow), "right", "keep")
         gSheet.setAlignment("F" + str(gSheetRow), "right", "keep")
         gSheet.setAlignment("G" + str(gSheetRow), "right", "keep")
@@ -3228,9 +4387,7 @@ def setViewD(iCaller="setViewD"):
     global gSheetRow
 
     # add values
-    for key in dbDA.keys():
-        a = key.split(":")
-
+    for g in getDBGroups(getDBColumns(iCaller), iCaller):
         # text header decoration
         vCell = "A" + str(gSheetRow) + ":G" + str(gSheetRow)
         gSheet.setStyle(vCell, "bold", "add")
@@ -3238,7 +4395,7 @@ def setViewD(iCaller="setViewD"):
         gSheet.mergeCells(vCell)
 
         # set group name
-        gSheet.set("A" + str(gSheetRow), toSheet(a[4], "string", iCaller))
+        gSheet.set("A" + str(gSheetRow), toSheet(g["group"], "string", iCaller))
 
         # go to next spreadsheet row
         gSheetRow = gSheetRow + 1
@@ -3275,12 +4432,12 @@ def setViewD(iCaller="setViewD"):
         # go to next spreadsheet row
         gSheetRow = gSheetRow + 1
 
-        gSheet.set("B" + str(gSheetRow), toSheet(a[1], "d", iCaller))
+        gSheet.set("B" + str(gSheetRow), toSheet(g["width"], "d", iCaller))
         gSheet.set("C" + str(gSheetRow), "x")
-        gSheet.set("D" + str(gSheetRow), toSheet(a[2], "d", iCaller))
-        gSheet.set("E" + str(gSheetRow), toSheet(a[0], "d", iCaller))
-        gSheet.set("F" + str(gSheetRow), toSheet(dbDQ[key], "string", iCaller))
-        gSheet.set("G" + str(gSheetRow), toSheet(dbDA[key], "area", iCaller))
+        gSheet.set("D" + str(gSheetRow), toSheet(g["length"], "d", iCaller))
+        gSheet.set("E" + str(gSheetRow), toSheet(g["thick"], "d", iCaller))
+        gSheet.set("F" + str(gSheetRow), toSheet(g["qty"], "string", iCaller))
+        gSheet.set("G" + str(gSheetRow), toSheet(g["area"], "area", iCaller))
 
         # go to next spreadsheet row
         gSheetRow = gSheetRow + 1
@@ -3290,13 +4447,9 @@ def setViewD(iCaller="setViewD"):
         gSheet.setAlignment(vCell, "right", "keep")
 
         # if there are faces with edgeband
-        faces = 0
-        try:
-            faces = str(dbEFD[key])
-        except:
-            faces = 0
+        if g["faces"] != "":
+            [faceN, faceD, faceV] = g["faces"]
 
-        if faces != 0:
             # go to next spreadsheet row
             gSheetRow = gSheetRow + 1
 
@@ -3329,12 +4482,12 @@ def setViewD(iCaller="setViewD"):
 
             try:
                 # try get values
-                gSheet.set("A" + str(gSheetRow), toSheet(dbEFN[key][4], "string", iCaller))
-                gSheet.set("B" + str(gSheetRow), toSheet(dbEFN[key][5], "string", iCaller))
-                gSheet.set("D" + str(gSheetRow), toSheet(dbEFN[key][0], "string", iCaller))
-                gSheet.set("E" + str(gSheetRow), toSheet(dbEFN[key][1], "string", iCaller))
-                gSheet.set("F" + str(gSheetRow), toSheet(dbEFN[key][2], "string", iCaller))
-                gSheet.set("G" + str(gSheetRow), toSheet(dbEFN[key][3], "string", iCaller))
+                gSheet.set("A" + str(gSheetRow), toSheet(faceN[4], "string", iCaller))
+                gSheet.set("B" + str(gSheetRow), toSheet(faceN[5], "string", iCaller))
+                gSheet.set("D" + str(gSheetRow), toSheet(faceN[0], "string", iCaller))
+                gSheet.set("E" + str(gSheetRow), toSheet(faceN[1], "string", iCaller))
+                gSheet.set("F" + str(gSheetRow), toSheet(faceN[2], "string", iCaller))
+                gSheet.set("G" + str(gSheetRow), toSheet(faceN[3], "string", iCaller))
 
             except:
                 skip = 1
@@ -3352,34 +4505,34 @@ def setViewD(iCaller="setViewD"):
 
             try:
                 # try get values
-                if dbEFD[key][4] > 0:
-                    gSheet.set("A" + str(gSheetRow), toSheet(dbEFD[key][4], "d", iCaller))
-                if dbEFD[key][4] == -1:
+                if faceD[4] > 0:
+                    gSheet.set("A" + str(gSheetRow), toSheet(faceD[4], "d", iCaller))
+                if faceD[4] == -1:
                     gSheet.set("A" + str(gSheetRow), gLang14)
 
-                if dbEFD[key][5] > 0:
-                    gSheet.set("B" + str(gSheetRow), toSheet(dbEFD[key][5], "d", iCaller))
-                if dbEFD[key][5] == -1:
+                if faceD[5] > 0:
+                    gSheet.set("B" + str(gSheetRow), toSheet(faceD[5], "d", iCaller))
+                if faceD[5] == -1:
                     gSheet.set("B" + str(gSheetRow), gLang14)
 
-                if dbEFD[key][0] > 0:
-                    gSheet.set("D" + str(gSheetRow), toSheet(dbEFD[key][0], "d", iCaller))
-                if dbEFD[key][0] == -1:
+                if faceD[0] > 0:
+                    gSheet.set("D" + str(gSheetRow), toSheet(faceD[0], "d", iCaller))
+                if faceD[0] == -1:
                     gSheet.set("D" + str(gSheetRow), gLang14)
 
-                if dbEFD[key][1] > 0:
-                    gSheet.set("E" + str(gSheetRow), toSheet(dbEFD[key][1], "d", iCaller))
-                if dbEFD[key][1] == -1:
+                if faceD[1] > 0:
+                    gSheet.set("E" + str(gSheetRow), toSheet(faceD[1], "d", iCaller))
+                if faceD[1] == -1:
                     gSheet.set("E" + str(gSheetRow), gLang14)
 
-                if dbEFD[key][2] > 0:
-                    gSheet.set("F" + str(gSheetRow), toSheet(dbEFD[key][2], "d", iCaller))
-                if dbEFD[key][2] == -1:
+                if faceD[2] > 0:
+                    gSheet.set("F" + str(gSheetRow), toSheet(faceD[2], "d", iCaller))
+                if faceD[2] == -1:
                     gSheet.set("F" + str(gSheetRow), gLang14)
 
-                if dbEFD[key][3] > 0:
-                    gSheet.set("G" + str(gSheetRow), toSheet(dbEFD[key][3], "d", iCaller))
-                if dbEFD[key][3] == -1:
+                if faceD[3] > 0:
+                    gSheet.set("G" + str(gSheetRow), toSheet(faceD[3], "d", iCaller))
+                if faceD[3] == -1:
                     gSheet.set("G" + str(gSheetRow), gLang14)
 
             except:
@@ -3398,12 +4551,12 @@ def setViewD(iCaller="setViewD"):
 
             try:
                 # try get values
-                gSheet.set("A" + str(gSheetRow), toSheet(dbEFV[key][4], "string", iCaller))
-                gSheet.set("B" + str(gSheetRow), toSheet(dbEFV[key][5], "string", iCaller))
-                gSheet.set("D" + str(gSheetRow), toSheet(dbEFV[key][0], "string", iCaller))
-                gSheet.set("E" + str(gSheetRow), toSheet(dbEFV[key][1], "string", iCaller))
-                gSheet.set("F" + str(gSheetRow), toSheet(dbEFV[key][2], "string", iCaller))
-                gSheet.set("G" + str(gSheetRow), toSheet(dbEFV[key][3], "string", iCaller))
+                gSheet.set("A" + str(gSheetRow), toSheet(faceV[4], "string", iCaller))
+                gSheet.set("B" + str(gSheetRow), toSheet(faceV[5], "string", iCaller))
+                gSheet.set("D" + str(gSheetRow), toSheet(faceV[0], "string", iCaller))
+                gSheet.set("E" + str(gSheetRow), toSheet(faceV[1], "string", iCaller))
+                gSheet.set("F" + str(gSheetRow), toSheet(faceV[2], "string", iCaller))
+                gSheet.set("G" + str(gSheetRow), toSheet(faceV[3], "string", iCaller))
 
             except:
                 skip = 1
@@ -3421,7 +4574,7 @@ def setViewD(iCaller="setViewD"):
 
         try:
             # set reference for object holes
-            vHoles = dbCNOH[str(a[3])][:-1].split(":")
+            vHoles = dbCNOH[str(g["label"])][:-1].split(":")
 
             for vKey in vHoles:
                 # go to next spreadsheet row
@@ -3551,10 +4704,10 @@ def setViewD(iCaller="setViewD"):
     # go to next spreadsheet row
     gSheetRow = gSheetRow + 1
 
-    for key in dbTQ.keys():
-        gSheet.set("E" + str(gSheetRow), toSheet(key, "d", iCaller))
-        gSheet.set("F" + str(gSheetRow), toSheet(dbTQ[key], "string", iCaller))
-        gSheet.set("G" + str(gSheetRow), toSheet(dbTA[key], "area", iCaller))
+    for g in getDBGroups(["thick"], iCaller):
+        gSheet.set("E" + str(gSheetRow), toSheet(g["thick"], "d", iCaller))
+        gSheet.set("F" + str(gSheetRow), toSheet(g["qty"], "string", iCaller))
+        gSheet.set("G" + str(gSheetRow), toSheet(g["area"], "area", iCaller))
         gSheet.setAlignment("E" + str(gSheetRow), "right", "keep")
         gSheet.setAlignment("F" + str(gSheetRow), "right", "keep")
         gSheet.setAlignment("G" + str(gSheetRow), "right", "keep")
@@ -3569,10 +4722,7 @@ def setViewC(iCaller="setViewC"):
     global gSheetRow
 
     # search objects for constraints (custom report)
-    for o in dbCNO:
-        # set key for db
-        vKey = o.Label
-
+    for vKey in dbCNO:
         # set object header
         vCell = "A" + str(gSheetRow)
         vStr = str(dbCNQ[vKey]) + " x "
@@ -3761,6 +4911,11 @@ def setViewEdge(iCaller="setViewEdge"):
     global gSheet
     global gSheetRow
 
+    # get edge size for all parts
+    vTotal = getDBSum("edge", iCaller)
+    vEdgeBand = getDBSum("edgeband", iCaller)
+    vEmpty = vTotal - vEdgeBand
+
     # merge cells for better look line separation
     vCell = "A" + str(gSheetRow) + ":G" + str(gSheetRow)
     gSheet.mergeCells(vCell)
@@ -3776,14 +4931,14 @@ def setViewEdge(iCaller="setViewEdge"):
     gSheet.setAlignment(vCell, "left", "keep")
 
     vCell = "G" + str(gSheetRow)
-    gSheet.set(vCell, toSheet(dbE["total"], "edge", iCaller))
+    gSheet.set(vCell, toSheet(vTotal, "edge", iCaller))
     gSheet.setAlignment(vCell, "right", "keep")
 
     vCell = "A" + str(gSheetRow) + ":F" + str(gSheetRow)
     gSheet.setBackground(vCell, gHeadCS)
 
     # skip if edgeband is not set correctly
-    if dbE["empty"] >= 0 and dbE["edgeband"] > 0:
+    if vEmpty >= 0 and vEdgeBand > 0:
         # go to next spreadsheet row
         gSheetRow = gSheetRow + 1
 
@@ -3795,7 +4950,7 @@ def setViewEdge(iCaller="setViewEdge"):
         gSheet.setAlignment(vCell, "left", "keep")
 
         vCell = "G" + str(gSheetRow)
-        gSheet.set(vCell, toSheet(dbE["empty"], "edge", iCaller))
+        gSheet.set(vCell, toSheet(vEmpty, "edge", iCaller))
         gSheet.setAlignment(vCell, "right", "keep")
 
         vCell = "A" + str(gSheetRow) + ":F" + str(gSheetRow)
@@ -3812,7 +4967,7 @@ def setViewEdge(iCaller="setViewEdge"):
         gSheet.setAlignment(vCell, "left", "keep")
 
         vCell = "G" + str(gSheetRow)
-        gSheet.set(vCell, toSheet(dbE["edgeband"], "edge", iCaller))
+        gSheet.set(vCell, toSheet(vEdgeBand, "edge", iCaller))
         gSheet.setAlignment(vCell, "right", "keep")
 
         vCell = "A" + str(gSheetRow) + ":F" + str(gSheetRow)
@@ -3939,12 +5094,21 @@ def selectView(iCaller="selectView"):
     global gSheet
     global gSheetRow
 
-    # remove spreadsheet if exists
-    if gAD.getObject("toCut"):
-        gAD.removeObject("toCut")
+    gSheetRow = 1
+
+    # report file, views write to buffer only
+    if sReportFile != "":
+        gSheet = SheetWriter(None)
 
-    # create empty spreadsheet
-    gSheet = gAD.addObject("Spreadsheet::Sheet", "toCut")
+    else:
+        vName = getViewName("toCut", iCaller)
+
+        # remove spreadsheet if exists
+        if gAD.getObject(vName):
+            gAD.removeObject(vName)
+
+        # create empty spreadsheet, views write to buffer
+        gSheet = SheetWriter(gAD.addObject("Spreadsheet::Sheet", vName))
 
     # main report - quantity
     if sLTF == "q":
@@ -3999,6 +5163,35 @@ def selectView(iCaller="selectView"):
 
     finalViewSettings(iCaller)
 
+    # write buffer to report file or spreadsheet
+    if sReportFile != "":
+        setReportFile(gSheet, getViewName(sReportFile, iCaller), iCaller)
+    else:
+        gSheet.flush()
+
+
+# ###################################################################################################################
+def getViewName(iName, iCaller="getViewName"):
+    # spreadsheet or file name for current report type, the main report type keeps the name
+    if sLTF == gViews[0]:
+        return iName
+
+    [vName, vExt] = os.path.splitext(iName)
+
+    return vName + "_" + sLTF + vExt
+
+
+# ###################################################################################################################
+def selectViews(iCaller="selectViews"):
+    # other report types first, so the databases are set for the main report type at the end
+    for v in gViews[1:] + gViews[0]:
+        if len(gViews) > 1:
+            setViewRecords(v, iCaller)
+
+        selectView(iCaller)
+
+    return 0
+
 
 # ###################################################################################################################
 # TechDraw part
@@ -4062,6 +5255,324 @@ def setTechDraw(iCaller="setTechDraw"):
         gPrintSheet.CellEnd = "G" + str(gSheetRow)
 
 
+# ###################################################################################################################
+# Profile - record time for report stages
+# ###################################################################################################################
+
+
+# ###################################################################################################################
+def getProfileStage(iName, iFunction):
+    # function with time and calls recording, time includes nested calls
+    def vStage(*args, **kwargs):
+        vStart = time.perf_counter()
+
+        try:
+            return iFunction(*args, **kwargs)
+
+        finally:
+            vTime = time.perf_counter() - vStart
+
+            if iName in dbPS:
+                dbPS[iName][0] = dbPS[iName][0] + 1
+                dbPS[iName][1] = dbPS[iName][1] + vTime
+            else:
+                dbPS[iName] = [1, vTime]
+
+    vStage.profiled = iFunction
+    vStage.__name__ = iName
+
+    return vStage
+
+
+# ###################################################################################################################
+def setProfile(iCaller="setProfile"):
+    # record scan steps, furniture part handlers, database, view and TechDraw stages
+    dbPS.clear()
+    dbPT.clear()
+    del dbPO[:]
+
+    vStages = ["setVisibility", "setGroups", "scanObject", "setFurniturePart", "setContainer"]
+    vStages += ["setDB", "setDBApproximation", "setDBConstraints", "setDBAllConstraints", "setDBAdditional"]
+    vStages += ["setViewRecords", "selectViews", "selectView", "setReportFile", "setTechDraw"]
+    vStages += ["setViewQ", "setViewN", "setViewG", "setViewE", "setViewD", "setViewC", "setViewP", "setViewA"]
+    vStages += ["setViewEdge", "setViewAdditional", "finalViewSettings"]
+
+    for vName in vStages:
+        # only once
+        if not hasattr(globals()[vName], "profiled"):
+            globals()[vName] = getProfileStage(vName, globals()[vName])
+
+    # handlers from getDimensions and registered by registerFurniturePart
+    dbFH.clear()
+
+    for e in dbFP:
+        if callable(e[3]):
+            if not hasattr(e[3], "profiled"):
+                e[3] = getProfileStage(getFunctionName(e[3]), e[3])
+
+        elif not hasattr(globals()[e[3]], "profiled"):
+            globals()[e[3]] = getProfileStage(e[3], globals()[e[3]])
+
+    return 0
+
+
+# ###################################################################################################################
+def addProfileObject(iObj, iTime, iCaller="addProfileObject"):
+    vType = str(iObj.TypeId)
+
+    if vType in dbPT:
+        dbPT[vType][0] = dbPT[vType][0] + 1
+        dbPT[vType][1] = dbPT[vType][1] + iTime
+    else:
+        dbPT[vType] = [1, iTime]
+
+    dbPO.append([iTime, str(iObj.Label), vType])
+
+
+# ###################################################################################################################
+def getProfile(iCaller="getProfile"):
+    vProfile = dict()
+
+    vProfile["stages"] = [
+        {"stage": k, "calls": v[0], "time": v[1]} for k, v in sorted(dbPS.items(), key=lambda x: -x[1][1])
+    ]
+    vProfile["types"] = [
+        {"type": k, "objects": v[0], "time": v[1]} for k, v in sorted(dbPT.items(), key=lambda x: -x[1][1])
+    ]
+    vProfile["objects"] = [
+        {"object": o[1], "type": o[2], "time": o[0]} for o in sorted(dbPO, key=lambda x: -x[0])[:gProfileTop]
+    ]
+
+    return vProfile
+
+
+# ###################################################################################################################
+def showProfile(iCaller="showProfile"):
+    vProfile = getProfile(iCaller)
+
+    vOut = "\n"
+    vOut += "getDimensions profile, time in seconds includes nested stages" + "\n"
+
+    for vTable, vName, vCount in [
+        ("stages", "stage", "calls"),
+        ("types", "type", "objects"),
+        ("objects", "object", "type"),
+    ]:
+        vOut += "\n"
+        vOut += "%-40s %15s %12s" % (vName, vCount, "time") + "\n"
+
+        for r in vProfile[vTable]:
+            vOut += "%-40s %15s %12.6f" % (r[vName][:40], str(r[vCount])[:15], r["time"]) + "\n"
+
+    FreeCAD.Console.PrintMessage(vOut)
+
+    if gProfileFile != "":
+        with open(os.path.expanduser(gProfileFile), "w", encoding="utf-8") as f:
+            json.dump(vProfile, f, indent=1)
+
+    return 0
+
+
+# ###################################################################################################################
+# Cut-list API - no Qt GUI, no spreadsheet, no document changes
+# ###################################################################################################################
+
+
+# ###################################################################################################################
+def resetDB(iCaller="resetDB"):
+    global gApply
+    global gQty
+    global gRecords
+
+    for c in dbCL.values():
+        del c[:]
+
+    for db in [dbCNO, gErrors]:
+        del db[:]
+
+    for db in [dbCNQ, dbCNN, dbCNV, dbCNL, dbCNH, dbCNOH, dbARQ, dbARN, dbARV, dbSM, dbFL, dbAP]:
+        db.clear()
+
+    gApply = True
+    gQty = 1
+    gRecords = []
+
+
+# ###################################################################################################################
+def getDBRows(iCaller="getDBRows"):
+    # parts table as list of rows
+    vColumns = list(dbCL.keys())
+
+    return [dict(zip(vColumns, r)) for r in zip(*[dbCL[c] for c in vColumns])]
+
+
+# ###################################################################################################################
+def getCutList(iCaller="getCutList"):
+    # cut-list data for current report type
+
+    # edge size for all parts
+    vTotal = getDBSum("edge", iCaller)
+    vEdgeBand = getDBSum("edgeband", iCaller)
+
+    vConstraints = []
+    for vKey in dbCNQ.keys():
+        vConstraints.append(
+            {
+                "key": vKey,
+                "qty": dbCNQ[vKey],
+                "length": dbCNL.get(vKey, ""),
+                "header": dbCNH.get(vKey, ""),
+                "names": dbCNN[vKey].split(":"),
+                "values": dbCNV[vKey].split(":"),
+            }
+        )
+
+    vAdditional = []
+    for vKey in dbARQ.keys():
+        vAdditional.append(
+            {
+                "key": vKey,
+                "qty": dbARQ[vKey],
+                "names": dbARN[vKey].split(":"),
+                "values": dbARV[vKey].split(":"),
+            }
+        )
+
+    vResult = dict()
+    vResult["parts"] = getDBRows(iCaller)
+    vResult["groups"] = getDBGroups(getDBColumns(iCaller), iCaller)
+    vResult["thickness"] = getDBGroups(["thick"], iCaller)
+    vResult["edge"] = {"total": vTotal, "edgeband": vEdgeBand, "empty": vTotal - vEdgeBand}
+    vResult["constraints"] = vConstraints
+    vResult["additional"] = vAdditional
+
+    return vResult
+
+
+# ###################################################################################################################
+def computeCutList(iDoc, iSettings=None):
+    """
+    Description:
+
+        Scans document objects and returns cut-list data as Python structures. The Qt GUI,
+        spreadsheet and TechDraw page are not used, so this is able to run at FreeCADCmd.
+        Errors are collected at the result instead of the console output.
+
+    Args:
+
+        iDoc: document to scan
+        iSettings: dict with default settings to change, for example {"sLTF": "n", "sUnitsMetric": "in"},
+                   not given settings are reset to default values
+
+    Usage:
+
+        import getDimensions
+        result = getDimensions.computeCutList(FreeCAD.ActiveDocument, {"sLTF": "d"})
+
+    Result:
+
+        dict with keys:
+        "parts" - list of parts, the same as the part table, one dict for each part
+        "groups" - list of parts grouped by settings report type, with "qty" and "area" sums
+        "thickness" - list of parts grouped by thickness, with "qty" and "area" sums
+        "edge" - dict with "total", "edgeband" and "empty" edge size
+        "constraints" - list of dicts with "key", "qty", "length", "header", "names", "values"
+        "additional" - list of dicts with "key", "qty", "names", "values"
+        "errors" - list of dicts with "caller", "object", "place", "error"
+        "views" - only if sViews is set, dict with the same keys for each other report type,
+                  for example result["views"]["g"]["groups"]
+
+    """
+
+    global gAD
+    global gOBs
+
+    resetDB("computeCutList")
+
+    # record time for report stages
+    if gProfile == 1:
+        setProfile("computeCutList")
+
+    # set settings, the same way as Qt GUI does
+    if iSettings == None:
+        iSettings = dict()
+
+    vSettings = dict(gSettingsDefault)
+    vSettings.update(iSettings)
+
+    for k, v in vSettings.items():
+        if k in gSettingsNames:
+            globals()[k] = v
+        else:
+            showError("computeCutList", iDoc, "settings", "unknown setting " + str(k))
+
+    gAD = iDoc
+    gOBs = iDoc.Objects
+
+    initLang()
+    scanDocument(gOBs, "computeCutList")
+
+    vResult = getCutList("computeCutList")
+
+    # other report types from the same scan
+    if len(gViews) > 1:
+        vResult["views"] = dict()
+
+        for v in gViews[1:]:
+            setViewRecords(v, "computeCutList")
+            vResult["views"][v] = getCutList("computeCutList")
+
+        setViewRecords(gViews[0], "computeCutList")
+
+    vResult["errors"] = list(gErrors)
+
+    if gProfile == 1:
+        vResult["profile"] = getProfile("computeCutList")
+
+    return vResult
+
+
+# ###################################################################################################################
+def writeCutList(iDoc, iPath, iSettings=None):
+    """
+    Description:
+
+        Scans document objects and writes the report view selected by settings directly to file,
+        without the spreadsheet and TechDraw page, so this is able to run at FreeCADCmd.
+        If sViews is set, each other report type is written to separate file, for example
+        "cutlist_g.html" for report type "g".
+
+    Args:
+
+        iDoc: document to scan
+        iPath: file path, the file type is set by extension: .csv, .json, .md, .html
+        iSettings: dict with default settings to change, the same as for computeCutList
+
+    Usage:
+
+        import getDimensions
+        result = getDimensions.writeCutList(FreeCAD.ActiveDocument, "/tmp/cutlist.html", {"sLTF": "n"})
+
+    Result:
+
+        The same dict as computeCutList returns.
+
+    """
+
+    if iSettings == None:
+        iSettings = dict()
+
+    vSettings = dict(iSettings)
+    vSettings["sReportFile"] = iPath
+
+    vResult = computeCutList(iDoc, vSettings)
+    selectViews("writeCutList")
+
+    vResult["errors"] = list(gErrors)
+
+    return vResult
+
+
 # ###################################################################################################################
 # INIT - check status
 # ###################################################################################################################
@@ -4078,11 +5589,6 @@ def checkStatus():
 
     try:
         gAD = FreeCAD.ActiveDocument
-
-        # remove existing Fake Cube object if exists (auto clean after error)
-        if gAD.getObject("gFakeCube"):
-            gAD.removeObject("gFakeCube")
-
         gOBs = gAD.Objects
         gExecute = "yes"
 
@@ -4109,36 +5615,40 @@ def checkStatus():
 # MAIN
 # ###################################################################################################################
 
-# check if there is active document and init
-checkStatus()
+# run as macro only with Qt GUI, at FreeCADCmd use computeCutList()
+if FreeCAD.GuiUp:
+    # check if there is active document and init
+    checkStatus()
 
-# show Qt GUI
-if sQT == "yes":
-    showQtGUI()
+    # show Qt GUI
+    if sQT == "yes":
+        showQtGUI()
 
-# if Qt GUI ok button
-if gExecute == "yes":
-    # create Fake Cube but not call recompute
-    gFakeCube = gAD.addObject("Part::Box", "gFakeCube")
+    # if Qt GUI ok button
+    if gExecute == "yes":
+        # record time for report stages
+        if gProfile == 1:
+            setProfile("main")
 
-    # set language
-    initLang()
+        # set language
+        initLang()
 
-    # main loop for calculations
-    scanObjects(gOBs, "main")
+        # main loop for calculations, scan only changed objects
+        scanDocument(gOBs, "main")
 
-    # select and set view
-    selectView("main")
+        # select and set view for each report type
+        selectViews("main")
 
-    # set TechDraw page
-    setTechDraw("main")
+        # set TechDraw page, if report is not written to file
+        if sReportFile == "":
+            setTechDraw("main")
 
-    # remove existing fake Cube object before recompute
-    if gAD.getObject("gFakeCube"):
-        gAD.removeObject("gFakeCube")
+            # reload to see changes
+            gAD.recompute()
 
-    # reload to see changes
-    gAD.recompute()
+        # show recorded time
+        if gProfile == 1:
+            showProfile("main")
 
 
 # ###################################################################################################################
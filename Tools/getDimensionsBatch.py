@@ -0,0 +1,276 @@
+# ###################################################################################################################
+"""
+
+Batch cut-list, BOM for all FreeCAD files in the project folder
+Author: Darek L (github.com/dprojects)
+Latest version: https://github.com/dprojects/getDimensions
+
+Certified platform:
+https://github.com/dprojects/Woodworking
+
+Usage:
+
+    python getDimensionsBatch.py project_folder -o order.json
+    python getDimensionsBatch.py project_folder -o order.json -j 8 -s '{"sLTF": "n"}' --freecad /usr/bin/FreeCADCmd
+
+Each .FCStd file is scanned by separate FreeCADCmd process with getDimensions.computeCutList(),
+so the files are scanned in parallel. The results are merged into one order BOM with the files
+each part comes from.
+
+"""
+# ###################################################################################################################
+
+
+import argparse
+import concurrent.futures
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+
+# ###################################################################################################################
+# Default Settings ( CHANGE HERE IF NEEDED )
+# ###################################################################################################################
+
+
+# FreeCADCmd executable names to search for
+sFreeCADCmd = ["FreeCADCmd", "freecadcmd", "FreeCADCmd.exe"]
+
+# time limit for single file in seconds
+sTimeout = 600
+
+# ###################################################################################################################
+# Autoconfig - define globals ( NOT CHANGE HERE )
+# ###################################################################################################################
+
+
+# environment variables to pass job to worker process
+gEnvFile = "GETDIMENSIONS_BATCH_FILE"
+gEnvOut = "GETDIMENSIONS_BATCH_OUT"
+gEnvSettings = "GETDIMENSIONS_BATCH_SETTINGS"
+
+# part keys not used to merge the same parts from different files
+gSums = ["qty", "area", "faces"]
+
+
+# ###################################################################################################################
+# Worker - runs inside FreeCADCmd
+# ###################################################################################################################
+
+
+# ###################################################################################################################
+def runWorker():
+    import FreeCAD
+
+    # getDimensions is next to this file
+    sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+    import getDimensions
+
+    vSettings = json.loads(os.environ.get(gEnvSettings, "{}"))
+
+    doc = FreeCAD.openDocument(os.environ[gEnvFile], True)
+
+    try:
+        vResult = getDimensions.computeCutList(doc, vSettings)
+    finally:
+        FreeCAD.closeDocument(doc.Name)
+
+    with open(os.environ[gEnvOut], "w", encoding="utf-8") as f:
+        json.dump(vResult, f)
+
+
+# ###################################################################################################################
+# Parent - runs workers and merges results
+# ###################################################################################################################
+
+
+# ###################################################################################################################
+def getFiles(iPath):
+    # all FreeCAD files in project folder and subfolders
+    vFiles = []
+
+    for root, dirs, files in os.walk(iPath):
+        for f in files:
+            if f.lower().endswith(".fcstd"):
+                vFiles.append(os.path.join(root, f))
+
+    return sorted(vFiles)
+
+
+# ###################################################################################################################
+def getFreeCADCmd(iPath):
+    if iPath != "":
+        return iPath
+
+    for n in sFreeCADCmd:
+        vPath = shutil.which(n)
+        if vPath != None:
+            return vPath
+
+    raise RuntimeError("FreeCADCmd not found, use --freecad option")
+
+
+# ###################################################################################################################
+def scanFile(iFreeCADCmd, iFile, iSettings):
+    # scan single file by separate FreeCADCmd process
+    vFD, vOut = tempfile.mkstemp(suffix=".json")
+    os.close(vFD)
+
+    vEnv = dict(os.environ)
+    vEnv[gEnvFile] = os.path.abspath(iFile)
+    vEnv[gEnvOut] = vOut
+    vEnv[gEnvSettings] = json.dumps(iSettings)
+
+    try:
+        vRun = subprocess.run(
+            [iFreeCADCmd, os.path.abspath(__file__)],
+            env=vEnv,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            timeout=sTimeout,
+        )
+
+        if os.path.getsize(vOut) == 0:
+            vLog = vRun.stdout.decode("utf-8", "replace")
+            raise RuntimeError("no result, exit code " + str(vRun.returncode) + "\n" + vLog)
+
+        with open(vOut, encoding="utf-8") as f:
+            vResult = json.load(f)
+
+    except Exception as e:
+        vResult = {"failed": str(e)}
+
+    finally:
+        os.remove(vOut)
+
+    return vResult
+
+
+# ###################################################################################################################
+def addMerged(iDB, iKey, iEntry, iFile, iSums):
+    # add entry to merged database, sum values and keep quantity for each file
+    if iKey not in iDB:
+        vEntry = dict(iEntry)
+        vEntry["files"] = dict()
+
+        for k in iSums:
+            vEntry[k] = 0
+
+        iDB[iKey] = vEntry
+
+    vEntry = iDB[iKey]
+
+    for k in iSums:
+        vEntry[k] = vEntry[k] + iEntry[k]
+
+    vEntry["files"][iFile] = vEntry["files"].get(iFile, 0) + iEntry["qty"]
+
+
+# ###################################################################################################################
+def mergeResults(iResults):
+    # merge file results into single order BOM, in order of files
+    vFiles = dict()
+    vParts = dict()
+    vThickness = dict()
+    vConstraints = dict()
+    vAdditional = dict()
+    vEdge = {"total": 0, "edgeband": 0, "empty": 0}
+
+    for f, r in iResults:
+        if "failed" in r:
+            vFiles[f] = {"status": "failed", "error": r["failed"]}
+            continue
+
+        vFiles[f] = {"status": "ok", "edge": r["edge"], "errors": r["errors"]}
+
+        for p in r["groups"]:
+            vKey = tuple(v for k, v in p.items() if k not in gSums)
+            vPart = {k: v for k, v in p.items() if k != "faces"}
+            addMerged(vParts, vKey, vPart, f, ["qty", "area"])
+
+        for p in r["thickness"]:
+            vPart = {k: v for k, v in p.items() if k != "faces"}
+            addMerged(vThickness, p["thick"], vPart, f, ["qty", "area"])
+
+        for c in r["constraints"]:
+            addMerged(vConstraints, c["key"], c, f, ["qty"])
+
+        for a in r["additional"]:
+            addMerged(vAdditional, a["key"], a, f, ["qty"])
+
+        for k in vEdge.keys():
+            vEdge[k] = vEdge[k] + r["edge"][k]
+
+    vBOM = dict()
+    vBOM["files"] = vFiles
+    vBOM["parts"] = list(vParts.values())
+    vBOM["thickness"] = list(vThickness.values())
+    vBOM["edge"] = vEdge
+    vBOM["constraints"] = list(vConstraints.values())
+    vBOM["additional"] = list(vAdditional.values())
+
+    return vBOM
+
+
+# ###################################################################################################################
+def runBatch(iPath, iSettings=None, iJobs=0, iFreeCADCmd=""):
+    if iSettings == None:
+        iSettings = dict()
+
+    vFreeCADCmd = getFreeCADCmd(iFreeCADCmd)
+    vFiles = getFiles(iPath)
+
+    if iJobs <= 0:
+        iJobs = os.cpu_count() or 1
+
+    # each worker is separate process, so threads only wait for them
+    with concurrent.futures.ThreadPoolExecutor(max_workers=iJobs) as pool:
+        vJobs = [pool.submit(scanFile, vFreeCADCmd, f, iSettings) for f in vFiles]
+        vResults = [(os.path.relpath(f, iPath), j.result()) for f, j in zip(vFiles, vJobs)]
+
+    return mergeResults(vResults)
+
+
+# ###################################################################################################################
+def main():
+    vParser = argparse.ArgumentParser(description="Batch cut-list, BOM for all FreeCAD files in the project folder.")
+    vParser.add_argument("path", help="project folder with .FCStd files")
+    vParser.add_argument("-o", "--output", default="", help="output .json file, default stdout")
+    vParser.add_argument("-j", "--jobs", type=int, default=0, help="number of FreeCADCmd processes, default CPU count")
+    vParser.add_argument("-s", "--settings", default="{}", help='getDimensions settings as JSON, e.g. {"sLTF": "n"}')
+    vParser.add_argument("--freecad", default="", help="path to FreeCADCmd executable")
+    vArgs = vParser.parse_args()
+
+    vBOM = runBatch(vArgs.path, json.loads(vArgs.settings), vArgs.jobs, vArgs.freecad)
+
+    if vArgs.output == "":
+        json.dump(vBOM, sys.stdout, indent=1)
+    else:
+        with open(vArgs.output, "w", encoding="utf-8") as f:
+            json.dump(vBOM, f, indent=1)
+
+    # exit code for failed files
+    for f in vBOM["files"].values():
+        if f["status"] != "ok":
+            return 1
+
+    return 0
+
+
+# ###################################################################################################################
+# MAIN
+# ###################################################################################################################
+
+
+# FreeCADCmd worker or command line parent
+if gEnvFile in os.environ:
+    runWorker()
+
+elif __name__ == "__main__":
+    sys.exit(main())
+
+
+# ###################################################################################################################
@@ -0,0 +1,182 @@
+# ###################################################################################################################
+"""
+
+Part records cache for getDimensions macro
+Author: Darek L (github.com/dprojects)
+
+Certified platform:
+https://github.com/dprojects/Woodworking
+
+The getDimensions macro is reloaded each time the tool is called, so the part records
+from the previous run are stored here. The document observer marks changed objects,
+so the next report is able to scan only the changed objects and reuse records for the rest.
+
+"""
+# ###################################################################################################################
+
+
+import FreeCAD
+
+
+# ###################################################################################################################
+# Databases
+# ###################################################################################################################
+
+
+dbRecords = dict()  # part records, dbRecords[document name][object name] = list of records
+dbSettings = dict()  # settings used to create the records, dbSettings[document name] = tuple
+dbChanged = dict()  # changed objects, dbChanged[document name] = set of object names
+
+# observers registration status
+gObservers = []
+
+
+# ###################################################################################################################
+# Observer classes
+# ###################################################################################################################
+
+
+# ###################################################################################################################
+def setChanged(iDoc, iName):
+    try:
+        dbChanged[iDoc.Name].add(str(iName))
+    except:
+        dbChanged[iDoc.Name] = set([str(iName)])
+
+
+# ###################################################################################################################
+class DocumentObserver:
+    def slotCreatedObject(self, obj):
+        setChanged(obj.Document, obj.Name)
+
+    def slotDeletedObject(self, obj):
+        setChanged(obj.Document, obj.Name)
+
+    def slotChangedObject(self, obj, prop):
+        setChanged(obj.Document, obj.Name)
+
+    def slotCreatedDocument(self, doc):
+        clearRecords(doc.Name)
+
+    def slotDeletedDocument(self, doc):
+        clearRecords(doc.Name)
+
+
+# ###################################################################################################################
+class ViewObserver:
+    # edgeband colors and visibility are view provider properties
+    def slotChangedObject(self, vobj, prop):
+        try:
+            setChanged(vobj.Object.Document, vobj.Object.Name)
+        except:
+            skip = 1
+
+
+# ###################################################################################################################
+def setObservers():
+    # register only once, this module is not reloaded
+    if len(gObservers) != 0:
+        return 0
+
+    o = DocumentObserver()
+    FreeCAD.addDocumentObserver(o)
+    gObservers.append(o)
+
+    if FreeCAD.GuiUp:
+        import FreeCADGui
+
+        o = ViewObserver()
+        FreeCADGui.addDocumentObserver(o)
+        gObservers.append(o)
+
+    return 0
+
+
+# ###################################################################################################################
+# Records controllers
+# ###################################################################################################################
+
+
+# ###################################################################################################################
+def clearRecords(iDocName):
+    dbRecords.pop(iDocName, None)
+    dbSettings.pop(iDocName, None)
+    dbChanged.pop(iDocName, None)
+
+
+# ###################################################################################################################
+def clearAllRecords():
+    # the records for all documents are not valid, e.g. new furniture part function
+    dbRecords.clear()
+    dbSettings.clear()
+    dbChanged.clear()
+
+
+# ###################################################################################################################
+def getInvalid(iDoc):
+    # objects not valid for current document
+    invalid = set()
+
+    for docName in list(dbChanged.keys()):
+        # changes at current document are consumed by this report
+        if docName == iDoc.Name:
+            names = dbChanged.pop(docName)
+        else:
+            names = dbChanged[docName]
+
+        try:
+            doc = FreeCAD.getDocument(docName)
+        except:
+            doc = None
+
+        for n in names:
+            if docName == iDoc.Name:
+                invalid.add(n)
+
+            if doc == None:
+                continue
+
+            o = doc.getObject(n)
+            if o == None:
+                continue
+
+            # the object changes records of objects which use it (Array, Link, Pad, Mirror)
+            # and objects inside it (group name, inherited visibility)
+            for r in o.InListRecursive + o.OutListRecursive:
+                try:
+                    if r.Document.Name == iDoc.Name:
+                        invalid.add(r.Name)
+                except:
+                    skip = 1
+
+    return invalid
+
+
+# ###################################################################################################################
+def getRecords(iDoc, iSettings):
+    setObservers()
+
+    # no records or the report settings has been changed
+    if iDoc.Name not in dbRecords or dbSettings[iDoc.Name] != iSettings:
+        dbChanged.pop(iDoc.Name, None)
+        return dict()
+
+    invalid = getInvalid(iDoc)
+
+    records = dict()
+    for n, r in dbRecords[iDoc.Name].items():
+        if n not in invalid:
+            records[n] = r
+
+    return records
+
+
+# ###################################################################################################################
+def setRecords(iDoc, iSettings, iRecords):
+    dbRecords[iDoc.Name] = iRecords
+    dbSettings[iDoc.Name] = iSettings
+
+    return 0
+
+
+# ###################################################################################################################
@@ -24,6 +24,17 @@ https://github.com/dprojects/Woodworking
 # ###################################################################################################################
 
 
+import concurrent.futures
+import gzip
+import hashlib
+import io
+import json
+import os
+import types
+import xml.etree.ElementTree as ET
+import zipfile
+from xml.sax.saxutils import escape, quoteattr
+
 import Draft
 import FreeCAD
 import FreeCADGui
@@ -44,19 +55,39 @@ translate = FreeCAD.Qt.translate
 # "html" - HyperText Markup Language (.html file)
 # "json" - JavaScript Object Notation (.json file), see e.g. json2table.com
 # "md" - MarkDown (.md file), see e.g. dillinger.io
+# "ndjson" - newline delimited JSON, one object for each row (.ndjson file)
+# "xlsx" - Office Open XML spreadsheet, with styles and merged cells (.xlsx file)
+# "ods" - OpenDocument spreadsheet, with styles and merged cells (.ods file)
 sFileType = "html"
 
+# File compression:
+# "" - no compression
+# "gz" - gzip compressed file (e.g. .csv.gz file), for very large spreadsheets,
+#        not used for xlsx and ods because they are already compressed
+sCompress = ""
+
 # Export type:
 # "a" - all spreadsheet objects
 # "s" - selected spreadsheet only
 sExportType = "a"
 
+# Export jobs for all spreadsheets:
+# 0 - number of CPU cores
+# 1 - one spreadsheet after another
+# or set number of files written at the same time
+sJobs = 0
+
 # File path:
 # "~" - user home folder
 # "./" - current macro folder
 # or set Your custom path with write permissions
 sFilePath = "./"
 
+# Skip unchanged spreadsheets:
+# "yes" - export only spreadsheets changed since last export, see sheet2export.json manifest file
+# "no" - always export all files
+sSkipUnchanged = "yes"
+
 
 # ###################################################################################################################
 # Additional Settings ( CHANGE HERE IF NEEDED )
@@ -98,12 +129,52 @@ gFile = "result"  # will be overwritten later
 # init spreadsheet object
 gSheet = gAD  # will be overwritten later
 
-# init output result
-gOUT = ""
+# spreadsheet Label and Name for the file writers, the writers can run at other threads
+# so they should not use the FreeCAD spreadsheet object
+gSheetLabel = ""
+gSheetName = ""
+
+# init output result, file opened for the spreadsheet export
+gOUT = None
+
+# output buffer size
+gBufferSize = 1024 * 1024
+
+# JSON separators for rows and cells
+gSepR = ""
+gSepJ = ""
+
+# NDJSON current row
+gRow = dict()
+
+# file types written as zip archive with many XML files
+gArchives = ["xlsx", "ods"]
+
+# zip archive opened for the spreadsheet export
+gZIP = None
+
+# cell styles, gStyles[ ( style, background, alignment ) ] = index for XLSX and ODS,
+# gStyles[ CSS rules ] = index for HTML classes
+gStyles = dict()
+
+# XLSX current row number
+gRowN = 0
 
 # exported files names
 gExpFilesN = ""
 
+# unchanged files names, not exported
+gSkipFilesN = ""
+
+# export manifest, file name and hash of the exported content and settings
+gManifest = dict()
+
+# export manifest file name, stored next to the exported files
+gManifestFile = "sheet2export.json"
+
+# export format version, change it if the writers output is changed, so all files are exported again
+gManifestVersion = 1
+
 # console print separator
 gSepC = "\n ================================================================ \n"
 
@@ -123,6 +194,7 @@ dbCPS = dict()  # style
 dbCPB = dict()  # background
 dbCPRS = dict()  # row span
 dbCPCS = dict()  # column span
+dbCPR = dict()  # column and row, dbCPR[key] = [ column, row ]
 
 # max
 dbMaxR = 0  # row
@@ -228,7 +300,7 @@ def showQtMain():
             self.fileTypeL.move(10, 73)
 
             # options
-            self.fileTypeOlist = ("csv", "html", "json", "md")
+            self.fileTypeOlist = ("csv", "html", "json", "md", "ndjson", "xlsx", "ods")
             self.fileTypeO = QtGui.QComboBox(self)
             self.fileTypeO.addItems(self.fileTypeOlist)
             self.fileTypeO.setCurrentIndex(self.fileTypeOlist.index("html"))
@@ -385,6 +457,36 @@ def showQtMain():
                 self.customCSSti.hide()
                 self.emptyCellTi.setText("")
 
+            if selectedText == "ndjson":
+                self.fileTypeOIS.setText(translate("sheet2export", "Newline delimited JSON ( .ndjson file )"))
+                self.csvSL.hide()
+                self.csvSTi.hide()
+                self.customCSSbl.hide()
+                self.customCSSbo.hide()
+                self.customCSStil.hide()
+                self.customCSSti.hide()
+                self.emptyCellTi.setText("")
+
+            if selectedText == "xlsx":
+                self.fileTypeOIS.setText(translate("sheet2export", "Office Open XML spreadsheet ( .xlsx file )"))
+                self.csvSL.hide()
+                self.csvSTi.hide()
+                self.customCSSbl.hide()
+                self.customCSSbo.hide()
+                self.customCSStil.hide()
+                self.customCSSti.hide()
+                self.emptyCellTi.setText("")
+
+            if selectedText == "ods":
+                self.fileTypeOIS.setText(translate("sheet2export", "OpenDocument spreadsheet ( .ods file )"))
+                self.csvSL.hide()
+                self.csvSTi.hide()
+                self.customCSSbl.hide()
+                self.customCSSbo.hide()
+                self.customCSStil.hide()
+                self.customCSSti.hide()
+                self.emptyCellTi.setText("")
+
         def setEType(self, selectedText):
             global sExportType
 
@@ -478,7 +580,7 @@ def showError(iObj, iPlace, iError):
     try:
         FreeCAD.Console.PrintMessage("ERROR: ")
         FreeCAD.Console.PrintMessage(" | ")
-        FreeCAD.Console.PrintMessage(str(iObj.Label))
+        FreeCAD.Console.PrintMessage(str(getattr(iObj, "Label", iObj)))
         FreeCAD.Console.PrintMessage(" | ")
         FreeCAD.Console.PrintMessage(str(iPlace))
         FreeCAD.Console.PrintMessage(" | ")
@@ -499,46 +601,39 @@ def showError(iObj, iPlace, iError):
 
 # ###################################################################################################################
 def CSVbegin():
-    global gOUT
-
-    gOUT += ""
+    gOUT.write("")
 
 
 # ###################################################################################################################
 def CSVend():
-    global gOUT
-
-    gOUT += ""
+    gOUT.write("")
 
 
 # ###################################################################################################################
 def CSVrowOpen():
-    global gOUT
-
-    gOUT += ""
+    gOUT.write("")
 
 
 # ###################################################################################################################
 def CSVrowClose():
-    global gOUT
-
-    gOUT += "\n"
+    gOUT.write("\n")
 
 
 # ###################################################################################################################
 def CSVempty(iKey, iC, iR):
-    global gOUT
+    gOUT.write(str(sEmptyCell))
+    gOUT.write(sSepCSV)
+
 
-    gOUT += str(sEmptyCell)
-    gOUT += sSepCSV
+# ###################################################################################################################
+def CSVemptyCells(iC, iN, iR):
+    gOUT.write((str(sEmptyCell) + sSepCSV) * iN)
 
 
 # ###################################################################################################################
 def CSVcell(iKey, iCell, iC, iR):
-    global gOUT
-
-    gOUT += str(iCell)
-    gOUT += sSepCSV
+    gOUT.write(str(iCell))
+    gOUT.write(sSepCSV)
 
 
 # ###################################################################################################################
@@ -547,116 +642,94 @@ def CSVcell(iKey, iCell, iC, iR):
 
 
 # ###################################################################################################################
-def HTMLbegin():
-    global gOUT
+def getHTMLid():
+    # table id for CSS rules, so many tables can be placed at the same web page
+    return "s2e-" + "".join([l if l.isalnum() else "-" for l in str(gSheetName)])
+
 
+# ###################################################################################################################
+def HTMLbegin():
     # there is no need to add html document header here because if the file is html table
     # only the file is correctly parsed by browser, moreover this is easier to copy the
     # file content and place it to the post or other web page
-    gOUT += "<TABLE>\n"
+    setStyles()
+
+    # each cell style is set only once as CSS class
+    vID = "#" + getHTMLid()
+
+    gOUT.write("<STYLE>\n")
+    gOUT.write(vID + " TD {" + str(sCustomCSS) + "}\n")
+
+    for s in sorted(gStyles.keys(), key=lambda s: gStyles[s]):
+        gOUT.write(vID + " .c" + str(gStyles[s]) + " {" + s + "}\n")
+
+    gOUT.write("</STYLE>\n")
+    gOUT.write('<TABLE id="' + getHTMLid() + '">\n')
 
 
 # ###################################################################################################################
 def HTMLend():
-    global gOUT
-
-    gOUT += "</TABLE>"
+    gOUT.write("</TABLE>")
 
 
 # ###################################################################################################################
 def HTMLrowOpen():
-    global gOUT
-
-    gOUT += " <TR>\n"
+    gOUT.write(" <TR>\n")
 
 
 # ###################################################################################################################
 def HTMLrowClose():
-    global gOUT
-
-    gOUT += " </TR>\n"
+    gOUT.write(" </TR>\n")
 
 
 # ###################################################################################################################
-def HTMLempty(iKey, iC, iR):
-    global gOUT
+def getHTMLstyle(iKey):
+    # CSS rules for the cell, the same rules are the same CSS class
+    vStyle = ""
 
-    gOUT += "  <TD "
-
-    try:
-        gOUT += 'colspan="' + str(dbCPCS[iKey]) + '" '
-    except:
-        gOUT += ""
+    if iKey in dbCPA:
+        vStyle += "text-align:" + str(dbCPA[iKey]).split("|")[0] + ";"
 
-    try:
-        gOUT += 'rowspan="' + str(dbCPRS[iKey]) + '" '
-    except:
-        gOUT += ""
+    if iKey in dbCPB:
+        vStyle += "background-color:" + str(dbCPB[iKey]) + ";"
 
-    gOUT += "style="
-    gOUT += '"'
-    gOUT += str(sCustomCSS)
+    if iKey in dbCPS:
+        vStyle += "font-weight:" + str(dbCPS[iKey]) + ";"
 
-    try:
-        gOUT += "text-align:" + str(dbCPA[iKey]).split("|")[0] + ";"
-    except:
-        gOUT += ""
+    return vStyle
 
-    try:
-        gOUT += "background-color:" + str(dbCPB[iKey]) + ";"
-    except:
-        gOUT += ""
 
-    try:
-        gOUT += "font-weight:" + str(dbCPS[iKey]) + ";"
-    except:
-        gOUT += ""
+# ###################################################################################################################
+def getHTMLattributes(iKey):
+    vAttr = ""
 
-    gOUT += '"'
-    gOUT += ">"
-    gOUT += str(sEmptyCell)
-    gOUT += "</TD>\n"
+    if iKey in dbCPCS:
+        vAttr += ' colspan="' + str(dbCPCS[iKey]) + '"'
 
+    if iKey in dbCPRS:
+        vAttr += ' rowspan="' + str(dbCPRS[iKey]) + '"'
 
-# ###################################################################################################################
-def HTMLcell(iKey, iCell, iC, iR):
-    global gOUT
+    vStyle = getHTMLstyle(iKey)
 
-    gOUT += "  <TD "
+    if vStyle != "":
+        vAttr += ' class="c' + str(gStyles[vStyle]) + '"'
 
-    try:
-        gOUT += 'colspan="' + str(dbCPCS[iKey]) + '" '
-    except:
-        gOUT += ""
+    return vAttr
 
-    try:
-        gOUT += 'rowspan="' + str(dbCPRS[iKey]) + '" '
-    except:
-        gOUT += ""
 
-    gOUT += "style="
-    gOUT += '"'
-    gOUT += str(sCustomCSS)
+# ###################################################################################################################
+def HTMLempty(iKey, iC, iR):
+    gOUT.write("  <TD" + getHTMLattributes(iKey) + ">" + str(sEmptyCell) + "</TD>\n")
 
-    try:
-        gOUT += "text-align:" + str(dbCPA[iKey]).split("|")[0] + ";"
-    except:
-        gOUT += ""
 
-    try:
-        gOUT += "background-color:" + str(dbCPB[iKey]) + ";"
-    except:
-        gOUT += ""
+# ###################################################################################################################
+def HTMLemptyCells(iC, iN, iR):
+    gOUT.write(("  <TD>" + str(sEmptyCell) + "</TD>\n") * iN)
 
-    try:
-        gOUT += "font-weight:" + str(dbCPS[iKey]) + ";"
-    except:
-        gOUT += ""
 
-    gOUT += '"'
-    gOUT += ">"
-    gOUT += str(iCell)
-    gOUT += "</TD>\n"
+# ###################################################################################################################
+def HTMLcell(iKey, iCell, iC, iR):
+    gOUT.write("  <TD" + getHTMLattributes(iKey) + ">" + str(iCell) + "</TD>\n")
 
 
 # ###################################################################################################################
@@ -666,52 +739,99 @@ def HTMLcell(iKey, iCell, iC, iR):
 
 # ###################################################################################################################
 def JSONbegin():
-    global gOUT
+    global gSepR
 
-    gOUT += "["
+    gOUT.write("[")
+    gSepR = ""
 
 
 # ###################################################################################################################
 def JSONend():
-    global gOUT
-
-    gOUT = gOUT[:-1]
-    gOUT += "]"
+    gOUT.write("]")
 
 
 # ###################################################################################################################
 def JSONrowOpen():
-    global gOUT
+    global gSepR
+    global gSepJ
 
-    gOUT += "{"
+    gOUT.write(gSepR + "{")
+    gSepR = ","
+    gSepJ = ""
 
 
 # ###################################################################################################################
 def JSONrowClose():
-    global gOUT
-
-    gOUT = gOUT[:-1]
-    gOUT += "},"
+    gOUT.write("}")
 
 
 # ###################################################################################################################
 def JSONempty(iKey, iC, iR):
-    global gOUT
+    global gSepJ
 
     key = str(dbSKL[str(iC)])
-    gOUT += '"' + str(key) + '":'
-    gOUT += '"' + str(sEmptyCell) + '"'
-    gOUT += ","
+    gOUT.write(gSepJ + '"' + str(key) + '":' + '"' + str(sEmptyCell) + '"')
+    gSepJ = ","
+
+
+# ###################################################################################################################
+def JSONemptyCells(iC, iN, iR):
+    global gSepJ
+
+    gOUT.write(gSepJ + ",".join(['"' + str(dbSKL[str(c)]) + '":"' + str(sEmptyCell) + '"' for c in range(iC, iC + iN)]))
+    gSepJ = ","
 
 
 # ###################################################################################################################
 def JSONcell(iKey, iCell, iC, iR):
-    global gOUT
+    global gSepJ
 
     key = str(dbSKL[str(iC)])
-    gOUT += '"' + str(key) + '":'
-    gOUT += '"' + str(iCell) + '"'
-    gOUT += ","
+    gOUT.write(gSepJ + '"' + str(key) + '":' + '"' + str(iCell) + '"')
+    gSepJ = ","
+
+
+# ###################################################################################################################
+# NDJSON file format, one JSON object for each row
+# ###################################################################################################################
+
+
+# ###################################################################################################################
+def NDJSONbegin():
+    gOUT.write("")
+
+
+# ###################################################################################################################
+def NDJSONend():
+    gOUT.write("")
+
+
+# ###################################################################################################################
+def NDJSONrowOpen():
+    global gRow
+
+    gRow = dict()
+
+
+# ###################################################################################################################
+def NDJSONrowClose():
+    gOUT.write(json.dumps(gRow, ensure_ascii=False) + "\n")
+
+
+# ###################################################################################################################
+def NDJSONempty(iKey, iC, iR):
+    gRow[str(dbSKL[str(iC)])] = str(sEmptyCell)
+
+
+# ###################################################################################################################
+def NDJSONemptyCells(iC, iN, iR):
+    for c in range(iC, iC + iN):
+        gRow[str(dbSKL[str(c)])] = str(sEmptyCell)
+
+
+# ###################################################################################################################
+def NDJSONcell(iKey, iCell, iC, iR):
+    gRow[str(dbSKL[str(iC)])] = str(iCell)
 
 
 # ###################################################################################################################
@@ -721,14 +841,12 @@ def JSONcell(iKey, iCell, iC, iR):
 
 # ###################################################################################################################
 def MDbegin():
-    global gOUT
-
     c = 1
     while c < dbMaxC + 1:
-        gOUT += "|   "
+        gOUT.write("|   ")
         c = c + 1
 
-    gOUT += "|\n"
+    gOUT.write("|\n")
 
     c = 1
     while c < dbMaxC + 1:
@@ -740,264 +858,676 @@ def MDbegin():
             a = str(dbCPA[key]).split("|")[0]
 
             if a == "left":
-                gOUT += "|:--"
+                gOUT.write("|:--")
             if a == "right":
-                gOUT += "|--:"
+                gOUT.write("|--:")
             if a == "center":
-                gOUT += "|:-:"
+                gOUT.write("|:-:")
         except:
-            gOUT += "|---"
+            gOUT.write("|---")
 
         c = c + 1
 
-    gOUT += "|\n"
+    gOUT.write("|\n")
 
 
 # ###################################################################################################################
 def MDend():
-    global gOUT
-
-    gOUT += ""
+    gOUT.write("")
 
 
 # ###################################################################################################################
 def MDrowOpen():
-    global gOUT
-
-    gOUT += ""
+    gOUT.write("")
 
 
 # ###################################################################################################################
 def MDrowClose():
-    global gOUT
-
-    gOUT += "|"
-    gOUT += "\n"
+    gOUT.write("|")
+    gOUT.write("\n")
 
 
 # ###################################################################################################################
 def MDempty(iKey, iC, iR):
-    global gOUT
+    gOUT.write("|   ")
+    gOUT.write(str(sEmptyCell))
+
 
-    gOUT += "|   "
-    gOUT += str(sEmptyCell)
+# ###################################################################################################################
+def MDemptyCells(iC, iN, iR):
+    gOUT.write(("|   " + str(sEmptyCell)) * iN)
 
 
 # ###################################################################################################################
 def MDcell(iKey, iCell, iC, iR):
-    global gOUT
-
-    gOUT += "|   "
-    gOUT += str(iCell)
-    gOUT += "   "
+    gOUT.write("|   ")
+    gOUT.write(str(iCell))
+    gOUT.write("   ")
 
 
 # ###################################################################################################################
-# Database write controller
+# XLSX file format, Office Open XML spreadsheet
 # ###################################################################################################################
 
 
 # ###################################################################################################################
-def getKey(iC, iR):
-    letters = "ZABCDEFGHIJKLMNOPQRSTUVWXYZ"  # max 26
+def getStyleKey(iKey):
+    return (str(dbCPS.get(iKey, "")), str(dbCPB.get(iKey, "")), str(dbCPA.get(iKey, "")))
 
-    mod = int((iC % 26))
-    div = int((iC - 1) / 26)
 
-    keyC = ""
+# ###################################################################################################################
+def setStyles():
+    # styles are known before the rows are written, so the rows can be streamed
+    global gStyles
 
-    if iC < 27:
-        keyC = letters[iC]
-    else:
-        keyC = letters[div] + letters[mod]
+    gStyles = dict()
 
-    keyR = str(iR)
+    # in cells order, so the same spreadsheet always gets the same style numbers
+    vKeys = dict.fromkeys(dbCPA)
+    vKeys.update(dict.fromkeys(dbCPB))
+    vKeys.update(dict.fromkeys(dbCPS))
 
-    key = keyC + keyR
+    for k in vKeys:
+        if sFileType == "html":
+            s = getHTMLstyle(k)
+        else:
+            s = getStyleKey(k)
 
-    # for given column and row it returns
-    # spreadsheet key for cell like e.g. A5, AG125 etc
-    return str(key)
+        if s not in gStyles:
+            gStyles[s] = len(gStyles) + 1
 
 
 # ###################################################################################################################
-def setSK():
-    # set spreadsheet keys databases
-    c = 1
-    while c < 703:
-        # get key for first row and remove number
-        key = getKey(c, 1)[:-1]
+def getColor(iColor):
+    # FreeCAD color "#rrggbbaa" to "rrggbb"
+    return str(iColor).lstrip("#")[0:6]
 
-        # set spreadsheet key value
-        dbSKV[key] = c
 
-        # set spreadsheet key letter
-        dbSKL[str(c)] = key
+# ###################################################################################################################
+def getNumber(iKey):
+    # numbers are written as numbers, so they can be used in formulas
+    v = dbCPC.get(iKey, "")
 
-        # go to next column
-        c = c + 1
+    if isinstance(v, (int, float)) and not isinstance(v, bool):
+        return str(v)
 
+    return ""
 
-# ###################################################################################################################
-def setDB():
-    # import regular expressions
-    import re
 
-    # refer to globals
-    global dbMaxR
-    global dbMaxC
+# ###################################################################################################################
+def getSpans():
+    # merged cells, [ key, columns, rows ]
+    vSpans = []
 
-    # XML parse part from python doc
-    import xml.etree.ElementTree as ET
+    for k in sorted(set(dbCPCS.keys()) | set(dbCPRS.keys())):
+        cs = int(dbCPCS.get(k, 1))
+        rs = int(dbCPRS.get(k, 1))
 
-    result = str(gSheet.cells.Content)
-    root = ET.fromstring(result)
+        if cs > 1 or rs > 1:
+            vSpans.append([k, cs, rs])
 
-    # set only available data
-    for child in root:
-        root2 = dict(child.attrib)
+    return vSpans
 
-        # skip data not related to cells
-        try:
-            key = root2["address"]
-        except:
-            continue
 
-        try:
-            # the XML parse may not be consistent with the FreeCAD spreadsheet objects,
-            # the XML may contains extra characters like "=" or '' so you have to write
-            # the FreeCAD content not the XML content with the extra characters
-            dbCPC[key] = gSheet.get(key)
-        except:
-            skip = 1
+# ###################################################################################################################
+def XLSXbegin():
+    global gRowN
 
-        try:
-            dbCPA[key] = root2["alignment"]
-        except:
-            skip = 1
+    setStyles()
+    gRowN = 0
 
-        try:
-            dbCPS[key] = root2["style"]
-        except:
-            skip = 1
+    gOUT.write('<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n')
+    gOUT.write('<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">\n')
+    gOUT.write('<dimension ref="A1:' + getKey(max(dbMaxC, 1), max(dbMaxR, 1)) + '"/>\n')
+    gOUT.write("<sheetData>\n")
 
-        try:
-            dbCPB[key] = root2["backgroundColor"]
-        except:
-            skip = 1
 
-        try:
-            dbCPRS[key] = root2["rowSpan"]
-        except:
-            skip = 1
+# ###################################################################################################################
+def XLSXend():
+    gOUT.write("</sheetData>\n")
 
-        try:
-            dbCPCS[key] = root2["colSpan"]
-        except:
-            skip = 1
+    vSpans = getSpans()
 
-        # width is not set because web pages and other formats has its own
-        # page size, for advance science data the spreadsheet can be even
-        # for ZZ column, so its not make any sense to recalculate it,
-        # width of column should be in auto mode, as small as possible
-        # but keep the text readable and possible to print,
-        # columns can be adjusted manually if needed
+    if len(vSpans) > 0:
+        gOUT.write('<mergeCells count="' + str(len(vSpans)) + '">\n')
 
-    # set max row and max column
-    # search keys in content db
-    for k in dbCPC.keys():
-        # split spreadsheet key to word and number
-        res = [re.findall(r"(\w+?)(\d+)", str(k))[0]]
+        for k, cs, rs in vSpans:
+            [c, r] = getCR(k)
+            gOUT.write('<mergeCell ref="' + k + ":" + getKey(c + cs - 1, r + rs - 1) + '"/>\n')
 
-        w = str(res[0][0])  # word column
-        n = int(res[0][1])  # number rows
+        gOUT.write("</mergeCells>\n")
 
-        if int(dbSKV[w]) > int(dbMaxC):
-            dbMaxC = int(dbSKV[w])
+    gOUT.write("</worksheet>")
 
-        if int(n) > int(dbMaxR):
-            dbMaxR = int(n)
 
-    # search keys also in background db
-    # this can be page separator line using background color
-    for k in dbCPB.keys():
-        # split spreadsheet key to word and number
-        res = [re.findall(r"(\w+?)(\d+)", str(k))[0]]
+# ###################################################################################################################
+def XLSXrowOpen():
+    global gRowN
 
-        w = str(res[0][0])  # word column
-        n = int(res[0][1])  # number rows
+    gRowN = gRowN + 1
+    gOUT.write('<row r="' + str(gRowN) + '">')
 
-        if int(dbSKV[w]) > int(dbMaxC):
-            dbMaxC = int(dbSKV[w])
 
-        if int(n) > int(dbMaxR):
-            dbMaxR = int(n)
+# ###################################################################################################################
+def XLSXrowClose():
+    gOUT.write("</row>\n")
 
 
 # ###################################################################################################################
-def resetDB():
-    # reset db
-    global dbCPC
-    global dbCPA
-    global dbCPS
-    global dbCPB
-    global dbCPRS
-    global dbCPCS
+def XLSXempty(iKey, iC, iR):
+    # only cells with style, empty cells without style are not written
+    s = gStyles.get(getStyleKey(iKey), 0)
 
-    dbCPC.clear()  # content
-    dbCPA.clear()  # alignment
-    dbCPS.clear()  # style
-    dbCPB.clear()  # background
-    dbCPRS.clear()  # row span
-    dbCPCS.clear()  # column span
+    if s > 0:
+        gOUT.write('<c r="' + str(iKey) + '" s="' + str(s) + '"/>')
 
-    # reset output
-    global gOUT
 
-    gOUT = ""
+# ###################################################################################################################
+def XLSXemptyCells(iC, iN, iR):
+    gOUT.write("")
 
-    # max
-    global dbMaxR
-    global dbMaxC
 
-    dbMaxR = 0  # row
-    dbMaxC = 0  # column
+# ###################################################################################################################
+def XLSXcell(iKey, iCell, iC, iR):
+    s = gStyles.get(getStyleKey(iKey), 0)
+    n = getNumber(iKey)
 
+    gOUT.write('<c r="' + str(iKey) + '" s="' + str(s) + '"')
 
-# ###################################################################################################################
-# File format selector
-# ###################################################################################################################
+    if n != "":
+        gOUT.write("><v>" + n + "</v></c>")
+    else:
+        gOUT.write(' t="inlineStr"><is><t xml:space="preserve">' + escape(str(iCell)) + "</t></is></c>")
 
 
 # ###################################################################################################################
-def selectBegin():
-    if sFileType == "csv":
-        CSVbegin()
+def getXLSXstyles():
+    vFonts = ["<font/>"]
+    vFills = ['<fill><patternFill patternType="none"/></fill>', '<fill><patternFill patternType="gray125"/></fill>']
+    vXfs = ['<xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>']
 
-    if sFileType == "html":
-        HTMLbegin()
+    for s in sorted(gStyles.keys(), key=lambda s: gStyles[s]):
+        [style, background, alignment] = s
 
-    if sFileType == "json":
-        JSONbegin()
+        vFont = ""
+        if "bold" in style:
+            vFont += "<b/>"
+        if "italic" in style:
+            vFont += "<i/>"
+        if "underline" in style:
+            vFont += "<u/>"
 
-    if sFileType == "md":
-        MDbegin()
+        vFonts.append("<font>" + vFont + "</font>")
+        vFontId = len(vFonts) - 1
 
+        vFillId = 0
+        if background != "":
+            vFills.append(
+                '<fill><patternFill patternType="solid"><fgColor rgb="FF'
+                + getColor(background).upper()
+                + '"/></patternFill></fill>'
+            )
+            vFillId = len(vFills) - 1
 
-# ###################################################################################################################
-def selectEnd():
-    if sFileType == "csv":
-        CSVend()
+        vAlign = ""
+        for a in alignment.split("|"):
+            if a in ["left", "center", "right"]:
+                vAlign += ' horizontal="' + a + '"'
+            if a in ["top", "bottom"]:
+                vAlign += ' vertical="' + a + '"'
+            if a == "vcenter":
+                vAlign += ' vertical="center"'
 
-    if sFileType == "html":
-        HTMLend()
+        vXf = '<xf numFmtId="0" fontId="' + str(vFontId) + '" fillId="' + str(vFillId) + '" borderId="0" xfId="0"'
+        vXf += ' applyFont="1" applyFill="1" applyAlignment="1"><alignment' + vAlign + "/></xf>"
+        vXfs.append(vXf)
 
-    if sFileType == "json":
-        JSONend()
+    vXML = '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    vXML += '<styleSheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">\n'
+    vXML += '<fonts count="' + str(len(vFonts)) + '">' + "".join(vFonts) + "</fonts>\n"
+    vXML += '<fills count="' + str(len(vFills)) + '">' + "".join(vFills) + "</fills>\n"
+    vXML += '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>\n'
+    vXML += '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>\n'
+    vXML += '<cellXfs count="' + str(len(vXfs)) + '">' + "".join(vXfs) + "</cellXfs>\n"
+    vXML += '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>\n'
+    vXML += "</styleSheet>"
+
+    return vXML
+
+
+# ###################################################################################################################
+def closeXLSX():
+    # sheet name can be max 31 characters long, without special characters
+    vName = "".join([l for l in str(gSheetLabel) if l not in "[]:*?/\\"])[0:31]
+    if vName == "":
+        vName = "Sheet1"
+
+    vRel = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+    vType = "application/vnd.openxmlformats-officedocument.spreadsheetml"
+
+    vXML = '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    vXML += '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    vXML += '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    vXML += '<Default Extension="xml" ContentType="application/xml"/>'
+    vXML += '<Override PartName="/xl/workbook.xml" ContentType="' + vType + '.sheet.main+xml"/>'
+    vXML += '<Override PartName="/xl/worksheets/sheet1.xml" ContentType="' + vType + '.worksheet+xml"/>'
+    vXML += '<Override PartName="/xl/styles.xml" ContentType="' + vType + '.styles+xml"/>'
+    vXML += "</Types>"
+    gZIP.writestr("[Content_Types].xml", vXML)
+
+    vXML = '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    vXML += '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    vXML += '<Relationship Id="rId1" Type="' + vRel + '/officeDocument" Target="xl/workbook.xml"/>'
+    vXML += "</Relationships>"
+    gZIP.writestr("_rels/.rels", vXML)
+
+    vXML = '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    vXML += '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" xmlns:r="' + vRel + '">'
+    vXML += "<sheets><sheet name=" + quoteattr(vName) + ' sheetId="1" r:id="rId1"/></sheets>'
+    vXML += "</workbook>"
+    gZIP.writestr("xl/workbook.xml", vXML)
+
+    vXML = '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    vXML += '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    vXML += '<Relationship Id="rId1" Type="' + vRel + '/worksheet" Target="worksheets/sheet1.xml"/>'
+    vXML += '<Relationship Id="rId2" Type="' + vRel + '/styles" Target="styles.xml"/>'
+    vXML += "</Relationships>"
+    gZIP.writestr("xl/_rels/workbook.xml.rels", vXML)
+
+    gZIP.writestr("xl/styles.xml", getXLSXstyles())
+
+
+# ###################################################################################################################
+# ODS file format, OpenDocument spreadsheet
+# ###################################################################################################################
+
+
+# ###################################################################################################################
+def getODSattributes(iKey):
+    vAttr = ""
+
+    s = gStyles.get(getStyleKey(iKey), 0)
+    if s > 0:
+        vAttr += ' table:style-name="ce' + str(s) + '"'
+
+    if iKey in dbCPCS:
+        vAttr += ' table:number-columns-spanned="' + str(dbCPCS[iKey]) + '"'
+
+    if iKey in dbCPRS:
+        vAttr += ' table:number-rows-spanned="' + str(dbCPRS[iKey]) + '"'
+
+    return vAttr
+
+
+# ###################################################################################################################
+def ODSbegin():
+    setStyles()
+
+    gOUT.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+    gOUT.write("<office:document-content")
+    gOUT.write(' xmlns:office="urn:oasis:names:tc:opendocument:xmlns:office:1.0"')
+    gOUT.write(' xmlns:style="urn:oasis:names:tc:opendocument:xmlns:style:1.0"')
+    gOUT.write(' xmlns:text="urn:oasis:names:tc:opendocument:xmlns:text:1.0"')
+    gOUT.write(' xmlns:table="urn:oasis:names:tc:opendocument:xmlns:table:1.0"')
+    gOUT.write(' xmlns:fo="urn:oasis:names:tc:opendocument:xmlns:xsl-fo-compatible:1.0"')
+    gOUT.write(' office:version="1.2">\n')
+
+    gOUT.write("<office:automatic-styles>\n")
+
+    for s in sorted(gStyles.keys(), key=lambda s: gStyles[s]):
+        [style, background, alignment] = s
+
+        gOUT.write('<style:style style:name="ce' + str(gStyles[s]) + '" style:family="table-cell">')
+
+        vCell = ""
+        if background != "":
+            vCell += ' fo:background-color="#' + getColor(background) + '"'
+        if "top" in alignment.split("|"):
+            vCell += ' style:vertical-align="top"'
+        if "vcenter" in alignment.split("|"):
+            vCell += ' style:vertical-align="middle"'
+        if "bottom" in alignment.split("|"):
+            vCell += ' style:vertical-align="bottom"'
+
+        vText = ""
+        if "bold" in style:
+            vText += ' fo:font-weight="bold"'
+        if "italic" in style:
+            vText += ' fo:font-style="italic"'
+        if "underline" in style:
+            vText += ' style:text-underline-style="solid"'
+
+        vAlign = alignment.split("|")[0]
+        vAlign = {"left": "start", "center": "center", "right": "end"}.get(vAlign, "")
+
+        gOUT.write("<style:table-cell-properties" + vCell + "/>")
+        if vAlign != "":
+            gOUT.write('<style:paragraph-properties fo:text-align="' + vAlign + '"/>')
+        gOUT.write("<style:text-properties" + vText + "/>")
+        gOUT.write("</style:style>\n")
+
+    gOUT.write("</office:automatic-styles>\n")
+
+    gOUT.write("<office:body><office:spreadsheet>\n")
+    gOUT.write("<table:table table:name=" + quoteattr(str(gSheetLabel)) + ">\n")
+    gOUT.write('<table:table-column table:number-columns-repeated="' + str(max(dbMaxC, 1)) + '"/>\n')
+
+
+# ###################################################################################################################
+def ODSend():
+    gOUT.write("</table:table>\n")
+    gOUT.write("</office:spreadsheet></office:body>\n")
+    gOUT.write("</office:document-content>")
+
+
+# ###################################################################################################################
+def ODSrowOpen():
+    gOUT.write("<table:table-row>")
+
+
+# ###################################################################################################################
+def ODSrowClose():
+    gOUT.write("</table:table-row>\n")
+
+
+# ###################################################################################################################
+def ODSempty(iKey, iC, iR):
+    gOUT.write("<table:table-cell" + getODSattributes(iKey) + "/>")
+
+
+# ###################################################################################################################
+def ODSemptyCells(iC, iN, iR):
+    gOUT.write('<table:table-cell table:number-columns-repeated="' + str(iN) + '"/>')
+
+
+# ###################################################################################################################
+def ODScell(iKey, iCell, iC, iR):
+    n = getNumber(iKey)
+
+    gOUT.write("<table:table-cell" + getODSattributes(iKey))
+
+    if n != "":
+        gOUT.write(' office:value-type="float" office:value="' + n + '">')
+    else:
+        gOUT.write(' office:value-type="string">')
+
+    gOUT.write("<text:p>" + escape(str(iCell)) + "</text:p></table:table-cell>")
+
+
+# ###################################################################################################################
+def closeODS():
+    vXML = '<?xml version="1.0" encoding="UTF-8"?>\n'
+    vXML += '<manifest:manifest xmlns:manifest="urn:oasis:names:tc:opendocument:xmlns:manifest:1.0"'
+    vXML += ' manifest:version="1.2">\n'
+    vXML += ' <manifest:file-entry manifest:full-path="/" manifest:version="1.2"'
+    vXML += ' manifest:media-type="application/vnd.oasis.opendocument.spreadsheet"/>\n'
+    vXML += ' <manifest:file-entry manifest:full-path="content.xml" manifest:media-type="text/xml"/>\n'
+    vXML += "</manifest:manifest>"
+    gZIP.writestr("META-INF/manifest.xml", vXML)
+
+
+# ###################################################################################################################
+# Database write controller
+# ###################################################################################################################
+
+
+# ###################################################################################################################
+def getKey(iC, iR):
+    letters = "ZABCDEFGHIJKLMNOPQRSTUVWXYZ"  # max 26
+
+    mod = int((iC % 26))
+    div = int((iC - 1) / 26)
+
+    keyC = ""
+
+    if iC < 27:
+        keyC = letters[iC]
+    else:
+        keyC = letters[div] + letters[mod]
+
+    keyR = str(iR)
+
+    key = keyC + keyR
+
+    # for given column and row it returns
+    # spreadsheet key for cell like e.g. A5, AG125 etc
+    return str(key)
+
+
+# ###################################################################################################################
+def getCR(iKey):
+    # for given spreadsheet key like e.g. AG125 it returns column and row
+    if iKey in dbCPR:
+        return dbCPR[iKey]
+
+    keyC = str(iKey).rstrip("0123456789")
+    keyR = str(iKey)[len(keyC) :]
+
+    c = 0
+    for l in keyC:
+        c = c * 26 + ord(l) - 64
+
+    return [c, int(keyR)]
+
+
+# ###################################################################################################################
+def getRows():
+    # cells with any property for each row, sorted by column
+    # cells covered by colspan or rowspan have empty key, only for html
+    vRows = dict()
+
+    vKeys = set(dbCPC.keys())
+    for db in [dbCPA, dbCPS, dbCPB, dbCPRS, dbCPCS]:
+        vKeys.update(db.keys())
+
+    for k in vKeys:
+        [c, r] = getCR(k)
+
+        if c > dbMaxC or r > dbMaxR:
+            continue
+
+        vRows.setdefault(r, dict())[c] = k
+
+    if sFileType == "html":
+        for k in set(dbCPCS.keys()) | set(dbCPRS.keys()):
+            [c, r] = getCR(k)
+
+            if c > dbMaxC or r > dbMaxR:
+                continue
+
+            cs = int(dbCPCS.get(k, 1))
+            rs = int(dbCPRS.get(k, 1))
+
+            for sr in range(r, min(r + rs, dbMaxR + 1)):
+                for sc in range(c, min(c + cs, dbMaxC + 1)):
+                    if sr != r or sc != c:
+                        vRows.setdefault(sr, dict())[sc] = ""
+
+    for r in vRows.keys():
+        vRows[r] = sorted(vRows[r].items())
+
+    return vRows
+
+
+# ###################################################################################################################
+def setSK():
+    # set spreadsheet keys databases
+    c = 1
+    while c < 703:
+        # get key for first row and remove number
+        key = getKey(c, 1)[:-1]
+
+        # set spreadsheet key value
+        dbSKV[key] = c
+
+        # set spreadsheet key letter
+        dbSKL[str(c)] = key
+
+        # go to next column
+        c = c + 1
+
+
+# ###################################################################################################################
+def getContent(iKey, iContent):
+    # the XML content may not be consistent with the FreeCAD spreadsheet objects,
+    # the XML may contains extra characters like "=" or '' so for expressions and
+    # numbers with units you have to write the FreeCAD content not the XML content
+    if iContent[:1] == "'":
+        return iContent[1:]
+
+    if iContent[:1] == "=" or iContent[:1] in "0123456789+-.":
+        return gSheet.get(iKey)
+
+    return iContent
+
+
+# ###################################################################################################################
+def setDB():
+    # refer to globals
+    global dbMaxR
+    global dbMaxC
+    global gSheetLabel
+    global gSheetName
+
+    gSheetLabel = str(gSheet.Label)
+    gSheetName = str(gSheet.Name)
+
+    # single pass over the XML cells, without the whole tree in memory
+    vXML = io.BytesIO(str(gSheet.cells.Content).encode("utf-8"))
+
+    for event, child in ET.iterparse(vXML):
+        # skip data not related to cells
+        if child.tag != "Cell":
+            continue
+
+        attrib = child.attrib
+        key = attrib.get("address", "")
+
+        if key == "":
+            child.clear()
+            continue
+
+        [c, r] = getCR(key)
+        dbCPR[key] = [c, r]
+
+        if "content" in attrib:
+            try:
+                dbCPC[key] = getContent(key, attrib["content"])
+            except:
+                skip = 1
+
+        if "alignment" in attrib:
+            dbCPA[key] = attrib["alignment"]
+
+        if "style" in attrib:
+            dbCPS[key] = attrib["style"]
+
+        if "backgroundColor" in attrib:
+            dbCPB[key] = attrib["backgroundColor"]
+
+        if "rowSpan" in attrib:
+            dbCPRS[key] = attrib["rowSpan"]
+
+        if "colSpan" in attrib:
+            dbCPCS[key] = attrib["colSpan"]
+
+        # set max row and max column from content and background,
+        # background can be page separator line
+        if key in dbCPC or key in dbCPB:
+            if c > dbMaxC:
+                dbMaxC = c
+
+            if r > dbMaxR:
+                dbMaxR = r
+
+        child.clear()
+
+        # width is not set because web pages and other formats has its own
+        # page size, for advance science data the spreadsheet can be even
+        # for ZZ column, so its not make any sense to recalculate it,
+        # width of column should be in auto mode, as small as possible
+        # but keep the text readable and possible to print,
+        # columns can be adjusted manually if needed
+
+
+# ###################################################################################################################
+def resetDB():
+    # reset db
+    global dbCPC
+    global dbCPA
+    global dbCPS
+    global dbCPB
+    global dbCPRS
+    global dbCPCS
+
+    dbCPC.clear()  # content
+    dbCPA.clear()  # alignment
+    dbCPS.clear()  # style
+    dbCPB.clear()  # background
+    dbCPRS.clear()  # row span
+    dbCPCS.clear()  # column span
+    dbCPR.clear()  # column and row
+
+    # max
+    global dbMaxR
+    global dbMaxC
+
+    dbMaxR = 0  # row
+    dbMaxC = 0  # column
+
+
+# ###################################################################################################################
+# File format selector
+# ###################################################################################################################
+
+
+# ###################################################################################################################
+def selectBegin():
+    if sFileType == "csv":
+        CSVbegin()
+
+    if sFileType == "html":
+        HTMLbegin()
+
+    if sFileType == "json":
+        JSONbegin()
+
+    if sFileType == "md":
+        MDbegin()
+
+    if sFileType == "ndjson":
+        NDJSONbegin()
+
+    if sFileType == "xlsx":
+        XLSXbegin()
+
+    if sFileType == "ods":
+        ODSbegin()
+
+
+# ###################################################################################################################
+def selectEnd():
+    if sFileType == "csv":
+        CSVend()
+
+    if sFileType == "html":
+        HTMLend()
+
+    if sFileType == "json":
+        JSONend()
 
     if sFileType == "md":
         MDend()
 
+    if sFileType == "ndjson":
+        NDJSONend()
+
+    if sFileType == "xlsx":
+        XLSXend()
+
+    if sFileType == "ods":
+        ODSend()
+
 
 # ###################################################################################################################
 def selectRowOpen():
@@ -1013,6 +1543,15 @@ def selectRowOpen():
     if sFileType == "md":
         MDrowOpen()
 
+    if sFileType == "ndjson":
+        NDJSONrowOpen()
+
+    if sFileType == "xlsx":
+        XLSXrowOpen()
+
+    if sFileType == "ods":
+        ODSrowOpen()
+
 
 # ###################################################################################################################
 def selectRowClose():
@@ -1028,6 +1567,15 @@ def selectRowClose():
     if sFileType == "md":
         MDrowClose()
 
+    if sFileType == "ndjson":
+        NDJSONrowClose()
+
+    if sFileType == "xlsx":
+        XLSXrowClose()
+
+    if sFileType == "ods":
+        ODSrowClose()
+
 
 # ###################################################################################################################
 def selectEmpty(iKey, iC, iR):
@@ -1043,6 +1591,43 @@ def selectEmpty(iKey, iC, iR):
     if sFileType == "md":
         MDempty(iKey, iC, iR)
 
+    if sFileType == "ndjson":
+        NDJSONempty(iKey, iC, iR)
+
+    if sFileType == "xlsx":
+        XLSXempty(iKey, iC, iR)
+
+    if sFileType == "ods":
+        ODSempty(iKey, iC, iR)
+
+
+# ###################################################################################################################
+def selectEmptyCells(iC, iN, iR):
+    # iN empty cells without properties from column iC
+    if iN <= 0:
+        return
+
+    if sFileType == "csv":
+        CSVemptyCells(iC, iN, iR)
+
+    if sFileType == "html":
+        HTMLemptyCells(iC, iN, iR)
+
+    if sFileType == "json":
+        JSONemptyCells(iC, iN, iR)
+
+    if sFileType == "md":
+        MDemptyCells(iC, iN, iR)
+
+    if sFileType == "ndjson":
+        NDJSONemptyCells(iC, iN, iR)
+
+    if sFileType == "xlsx":
+        XLSXemptyCells(iC, iN, iR)
+
+    if sFileType == "ods":
+        ODSemptyCells(iC, iN, iR)
+
 
 # ###################################################################################################################
 def selectCell(iKey, iCell, iC, iR):
@@ -1058,6 +1643,15 @@ def selectCell(iKey, iCell, iC, iR):
     if sFileType == "md":
         MDcell(iKey, iCell, iC, iR)
 
+    if sFileType == "ndjson":
+        NDJSONcell(iKey, iCell, iC, iR)
+
+    if sFileType == "xlsx":
+        XLSXcell(iKey, iCell, iC, iR)
+
+    if sFileType == "ods":
+        ODScell(iKey, iCell, iC, iR)
+
 
 # ###################################################################################################################
 # Set output
@@ -1066,135 +1660,195 @@ def selectCell(iKey, iCell, iC, iR):
 
 # ###################################################################################################################
 def setOUTPUT():
-    if sQT == "yes":
-        if int(dbMaxR * dbMaxC) > 10000:
-            info = ""
-            info += translate("sheet2export", "The spreadsheet") + " " + str(gSheet.Label)
-            info += " " + translate("sheet2export", "has") + ":" + " " + "\n\n"
-            info += str(dbMaxC) + " " + translate("sheet2export", "columns") + "\n"
-            info += str(dbMaxR) + " " + translate("sheet2export", "rows") + "\n"
-            info += "\n"
-            info += translate("sheet2export", "This may take several minutes to export file.")
-            info += "\n"
-            info += (
-                translate(
-                    "sheet2export",
-                    "Would you like to wait (ok) or skip (cancel) the spreadsheet?",
-                )
-                + "\t\t"
-            )
-            info += "\n\n"
-            reply = QtGui.QMessageBox.question(
-                None,
-                "",
-                str(info),
-                QtGui.QMessageBox.Yes | QtGui.QMessageBox.No,
-                QtGui.QMessageBox.No,
-            )
-
-            if reply == QtGui.QMessageBox.Yes:
-                skip = 0
-
-            if reply == QtGui.QMessageBox.No:
-                skip = 1
-                return -1
-
     # set begin of the spreadsheet table
     selectBegin()
 
-    # set variables for loop
-    colSpan = 0
-    rowSpan = 0
-    vCell = ""
-    c = 1
-    r = 1
+    # only cells with properties are parsed, empty cells between them are added at once
+    vRows = getRows()
 
-    # just simple walk thru the matrix and setting each cell
+    r = 1
     while r <= dbMaxR:
-        FreeCAD.Console.PrintMessage(".")
-        FreeCAD.Console.PrintMessage("")
-
         # set row extra properties
         selectRowOpen()
 
-        # go thru columns for given row
-        while c <= dbMaxC:
-            # get access point
-            vKey = str(dbSKL[str(c)]) + str(r)
-
-            try:
-                # get content
-                vCell = str(dbCPC[vKey])
-
-                # set colspan before you set the cell
-                try:
-                    colSpan = int(dbCPCS[vKey])
-                    rowSpan = int(dbCPRS[vKey])
-                except:
-                    skip = 1
-
-                # set the cell content
-                if vCell != "":
-                    selectCell(vKey, vCell, c, r)
-                else:
-                    selectEmpty(vKey, c, r)
+        c = 1
+        for vC, vKey in vRows.get(r, []):
+            # empty cells before
+            selectEmptyCells(c, vC - c, r)
+            c = vC + 1
 
-            except:
-                # if there was no such cell access point it will be empty cell
-                # if there is open colspan this should be skipped
-                if sFileType == "html":
-                    if colSpan == 0 or rowSpan == 0:
-                        selectEmpty(vKey, c, r)
+            # skip cells covered by colspan or rowspan
+            if vKey == "":
+                continue
 
-                # colspan is not supported by the file type
-                else:
-                    selectEmpty(vKey, c, r)
+            # get content
+            vCell = str(dbCPC.get(vKey, ""))
 
-            # if the cell was written and there is colspan open
-            if colSpan > 0:
-                colSpan = colSpan - 1
+            # set the cell content
+            if vCell != "":
+                selectCell(vKey, vCell, vC, r)
+            else:
+                selectEmpty(vKey, vC, r)
 
-            # just go to next column
-            c = c + 1
+        # empty cells to the last column
+        selectEmptyCells(c, dbMaxC + 1 - c, r)
 
         # add extra close row properties
         selectRowClose()
 
-        if rowSpan > 0:
-            rowSpan = rowSpan - 1
-
         # set variables for next row
-        c = 1
         r = r + 1
 
     # set end of the spreadsheet table
     selectEnd()
 
-    # set info
-    FreeCAD.Console.PrintMessage("done.")
-
 
 # ###################################################################################################################
 # Save spreadsheet data to file
 # ###################################################################################################################
 
 
+# ###################################################################################################################
+def getFile():
+    vRoot = os.path.expanduser(sFilePath)
+    vFileName = str(gFile) + "." + str(sFileType)
+
+    if sCompress == "gz" and sFileType not in gArchives:
+        vFileName += ".gz"
+
+    return os.path.join(vRoot, vFileName)
+
+
+# ###################################################################################################################
+def openArchive():
+    global gOUT
+    global gZIP
+
+    gZIP = zipfile.ZipFile(getFile(), "w", zipfile.ZIP_DEFLATED)
+
+    # rows are streamed to the archive, other small XML files are added at the end
+    if sFileType == "xlsx":
+        vEntry = "xl/worksheets/sheet1.xml"
+
+    if sFileType == "ods":
+        # mimetype must be the first file and not compressed
+        gZIP.writestr("mimetype", "application/vnd.oasis.opendocument.spreadsheet", zipfile.ZIP_STORED)
+        vEntry = "content.xml"
+
+    gOUT = io.TextIOWrapper(gZIP.open(vEntry, "w"), encoding="utf-8")
+
+
+# ###################################################################################################################
+def closeArchive():
+    global gZIP
+
+    if sFileType == "xlsx":
+        closeXLSX()
+
+    if sFileType == "ods":
+        closeODS()
+
+    gZIP.close()
+    gZIP = None
+
+
+# ###################################################################################################################
+def openFile():
+    global gOUT
+
+    # rows are written directly to the file, so the whole output is never kept in memory
+    if sFileType in gArchives:
+        openArchive()
+    elif sCompress == "gz":
+        gOUT = gzip.open(getFile(), "wt")
+    else:
+        gOUT = open(getFile(), "w", buffering=gBufferSize)
+
+
 # ###################################################################################################################
 def saveToDisk():
+    global gOUT
     global gExpFilesN
 
-    import os
-    import sys
-    from os.path import expanduser
+    gOUT.close()
+    gOUT = None
 
-    vRoot = expanduser(sFilePath)
-    vFileName = str(gFile) + "." + str(sFileType)
-    vFile = os.path.join(vRoot, vFileName)
+    if sFileType in gArchives:
+        closeArchive()
+
+    gExpFilesN += getFile() + "\t\n"
+
+
+# ###################################################################################################################
+# Export manifest
+# ###################################################################################################################
+
+
+# ###################################################################################################################
+def getHash():
+    # hash of the spreadsheet data and all settings used to create the file
+    vData = [gManifestVersion, gSheetName, sEmptyCell, sSepCSV, sCustomCSS, sCompress]
+    vData += [dbCPC, dbCPA, dbCPS, dbCPB, dbCPRS, dbCPCS, dbMaxR, dbMaxC]
 
-    with open(vFile, "w") as vFH:
-        vFH.write("%s" % gOUT)
+    vData = json.dumps(vData, sort_keys=True, default=str)
 
-    gExpFilesN += vFile + "\t\n"
+    return hashlib.sha256(vData.encode("utf-8")).hexdigest()
+
+
+# ###################################################################################################################
+def isUnchanged():
+    # the file was exported before with the same data and settings
+    if sSkipUnchanged != "yes":
+        return False
+
+    if not os.path.exists(getFile()):
+        return False
+
+    return gManifest.get(os.path.basename(getFile()), "") == getHash()
+
+
+# ###################################################################################################################
+def loadManifest():
+    global gManifest
+
+    vFile = os.path.join(os.path.expanduser(sFilePath), gManifestFile)
+
+    try:
+        with open(vFile, "r", encoding="utf-8") as f:
+            gManifest = json.load(f)
+    except:
+        gManifest = dict()
+
+
+# ###################################################################################################################
+def saveManifest():
+    vFile = os.path.join(os.path.expanduser(sFilePath), gManifestFile)
+
+    with open(vFile, "w", encoding="utf-8") as f:
+        json.dump(gManifest, f, indent=1, sort_keys=True)
+
+
+# ###################################################################################################################
+def skipFile():
+    global gSkipFilesN
+
+    gSkipFilesN += getFile() + "\t\n"
+
+    # set info
+    FreeCAD.Console.PrintMessage("unchanged.")
+
+
+# ###################################################################################################################
+def showExported():
+    info = ""
+    info += translate("sheet2export", "Exported files")
+    info += ": \n\n" + str(gExpFilesN) + "\n\n"
+
+    if gSkipFilesN != "":
+        info += translate("sheet2export", "Unchanged files")
+        info += ": \n\n" + str(gSkipFilesN) + "\n\n"
+
+    showInfo(info)
 
 
 # ###################################################################################################################
@@ -1203,22 +1857,114 @@ def saveToDisk():
 
 
 # ###################################################################################################################
-def runTasks():
+def getTaskGlobals():
+    # copy of the globals and databases for current spreadsheet, the functions are bound
+    # to the copy so the spreadsheet can be written at the same time as other spreadsheets
+    vGlobals = dict(globals())
+
+    for db in ["dbCPC", "dbCPA", "dbCPS", "dbCPB", "dbCPRS", "dbCPCS", "dbCPR", "gRow"]:
+        vGlobals[db] = dict(vGlobals[db])
+
+    vGlobals["gOUT"] = None
+    vGlobals["gZIP"] = None
+    vGlobals["gSheet"] = None
+    vGlobals["gExpFilesN"] = ""
+
+    for k, v in globals().items():
+        if isinstance(v, types.FunctionType) and v.__globals__ is globals():
+            vGlobals[k] = types.FunctionType(v.__code__, vGlobals, v.__name__, v.__defaults__, v.__closure__)
+
+    return vGlobals
+
+
+# ###################################################################################################################
+def showProgress(iTask, iDone, iAll, iStatus):
+    FreeCAD.Console.PrintMessage("\n")
+    FreeCAD.Console.PrintMessage(iStatus + ": [" + str(iDone) + "/" + str(iAll) + "] ")
+    FreeCAD.Console.PrintMessage(iTask["gSheetLabel"] + " ")
+
+    # keep the GUI responsive during export
+    if sQT == "yes":
+        QtGui.QApplication.processEvents()
+
+
+# ###################################################################################################################
+def runParallel(iTasks):
+    global gExpFilesN
+
+    vJobs = sJobs
+    if vJobs <= 0:
+        vJobs = os.cpu_count() or 1
+
+    # spreadsheets are already read, so the threads only write the files
+    with concurrent.futures.ThreadPoolExecutor(max_workers=vJobs) as pool:
+        vPending = set()
+        vTasks = dict()
+
+        for t in iTasks:
+            job = pool.submit(t["writeFile"])
+            vPending.add(job)
+            vTasks[job] = t
+
+        vDone = 0
+        while len(vPending) > 0:
+            vFinished, vPending = concurrent.futures.wait(
+                vPending, timeout=0.1, return_when=concurrent.futures.FIRST_COMPLETED
+            )
+
+            for job in vFinished:
+                vDone = vDone + 1
+
+                # errors not handled by the writer
+                try:
+                    job.result()
+                    showProgress(vTasks[job], vDone, len(iTasks), "Exported")
+                except:
+                    showError(vTasks[job]["gSheetLabel"], "runParallel", "File is not exported correctly.")
+                    showProgress(vTasks[job], vDone, len(iTasks), "Failed")
+
+    # exported files in the document order
+    for t in iTasks:
+        gExpFilesN += t["gExpFilesN"]
+
+
+# ###################################################################################################################
+def writeFile():
     try:
-        setDB()
+        openFile()
     except:
-        showError(gSheet, "setDB", "Databese is not set correctly.")
+        showError(gSheetLabel, "openFile", "File is not created correctly.")
+        return 0
 
     try:
-        if setOUTPUT() == -1:
-            return 0
+        setOUTPUT()
+        gManifest[os.path.basename(getFile())] = getHash()
     except:
-        showError(gSheet, "setOUTPUT", "Output is not set correctly.")
+        showError(gSheetLabel, "setOUTPUT", "Output is not set correctly.")
+        gManifest.pop(os.path.basename(getFile()), None)
 
     try:
         saveToDisk()
     except:
-        showError(gSheet, "saveToDisk", "File is not exported correctly.")
+        showError(gSheetLabel, "saveToDisk", "File is not exported correctly.")
+        gManifest.pop(os.path.basename(getFile()), None)
+
+
+# ###################################################################################################################
+def runTasks():
+    try:
+        setDB()
+    except:
+        showError(gSheet, "setDB", "Databese is not set correctly.")
+
+    if isUnchanged():
+        skipFile()
+        return 0
+
+    writeFile()
+
+    # set info
+    FreeCAD.Console.PrintMessage("done.")
 
 
 # ###################################################################################################################
@@ -1238,6 +1984,9 @@ if gExecute == "yes":
     except:
         showError(gAD, "setSK", "Spreadsheet key databases is not set correctly.")
 
+    # files exported before
+    loadManifest()
+
     # for selected
     if sExportType == "s":
         try:
@@ -1257,11 +2006,13 @@ if gExecute == "yes":
                 # create output file
                 runTasks()
 
+                try:
+                    saveManifest()
+                except:
+                    showError(gAD, "saveManifest", "Export manifest is not saved correctly.")
+
                 # info
-                info = ""
-                info += translate("sheet2export", "Exported files")
-                info += ": \n\n" + str(gExpFilesN) + "\n\n"
-                showInfo(info)
+                showExported()
             else:
                 showInfo(translate("sheet2export", "Please select spreadsheet to export."))
         except:
@@ -1269,7 +2020,11 @@ if gExecute == "yes":
 
     # for all spreadsheets
     elif sExportType == "a":
-        # search all objects and export spreadsheets
+        # spreadsheets to write
+        vTasks = []
+
+        # search all objects and read spreadsheets, the spreadsheet objects
+        # are used only here because FreeCAD objects should not be used by other threads
         for obj in gOBs:
             # try set spreadsheet
             gSheet = obj
@@ -1283,18 +2038,32 @@ if gExecute == "yes":
 
             # set info
             FreeCAD.Console.PrintMessage("\n")
-            FreeCAD.Console.PrintMessage("Exporting: ")
+            FreeCAD.Console.PrintMessage("Reading: ")
             FreeCAD.Console.PrintMessage(gSheet.Label + " ")
 
-            # create output file
             resetDB()
-            runTasks()
+
+            try:
+                setDB()
+            except:
+                showError(gSheet, "setDB", "Databese is not set correctly.")
+
+            if isUnchanged():
+                skipFile()
+                continue
+
+            vTasks.append(getTaskGlobals())
+
+        # create output files
+        runParallel(vTasks)
+
+        try:
+            saveManifest()
+        except:
+            showError(gAD, "saveManifest", "Export manifest is not saved correctly.")
 
         # info
-        info = ""
-        info += translate("sheet2export", "Exported files")
-        info += ": \n\n" + str(gExpFilesN) + "\n\n"
-        showInfo(info)
+        showExported()
     else:
         showError(gAD, "main", "Please set sExportType correctly.")
 